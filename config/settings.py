@@ -34,6 +34,10 @@ class Settings:
     llm_batch_size: int
     llm_batch_sleep_seconds: int
 
+    @property
+    def cache_dir(self) -> Path:
+        return self.output_dir / "cache"
+
 
 def get_settings() -> Settings:
     base_dir = Path(__file__).resolve().parents[1]
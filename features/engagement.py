@@ -131,55 +131,70 @@ def instructor_performance(live_sessions: pd.DataFrame, live_session_assigned: p
     return by_instructor
 
 
+def _window_counts(
+    user_ids: pd.Series,
+    anchors: pd.Series,
+    events: pd.DataFrame,
+    time_col: str,
+    windows: list[tuple[int, int]],
+) -> list[np.ndarray]:
+    # Per anchor row, count events of the same user with time in [anchor + start, anchor + end] days (inclusive).
+    events = events.dropna(subset=[time_col])
+    codes, _ = pd.factorize(pd.concat([user_ids, events["userId"]], ignore_index=True).astype(object))
+    anchor_codes, event_codes = codes[: len(user_ids)], codes[len(user_ids):]
+    has_user = event_codes >= 0
+    event_times = events[time_col].to_numpy(dtype="datetime64[ns]")[has_user]
+    bounds = [(anchors + pd.Timedelta(days=start), anchors + pd.Timedelta(days=end)) for start, end in windows]
+    bound_times = [bound.to_numpy(dtype="datetime64[ns]") for pair in bounds for bound in pair]
+
+    # Dense time ranks let (user code, time) collapse into one sortable int64 key.
+    all_times = np.unique(np.concatenate([event_times, *bound_times]))
+    width = len(all_times) + 1
+    event_keys = np.sort(event_codes[has_user].astype(np.int64) * width + np.searchsorted(all_times, event_times))
+    anchor_base = anchor_codes.astype(np.int64) * width
+
+    counts = []
+    for lower, upper in bounds:
+        lower_keys = anchor_base + np.searchsorted(all_times, lower.to_numpy(dtype="datetime64[ns]"))
+        upper_keys = anchor_base + np.searchsorted(all_times, upper.to_numpy(dtype="datetime64[ns]"))
+        counts.append(np.searchsorted(event_keys, upper_keys, side="right") - np.searchsorted(event_keys, lower_keys, side="left"))
+    return counts
+
+
 def buyers_remorse_window(
     payments: pd.DataFrame,
     live_session_attendance: pd.DataFrame,
     assignment_submissions: pd.DataFrame,
     login_history: pd.DataFrame,
 ) -> pd.DataFrame:
-    payments = payments[payments["status"] == "succeeded"].copy()
+    payments = payments[payments["status"] == "succeeded"]
     payments = payments.dropna(subset=["paidAt"])
+    if payments.empty:
+        return pd.DataFrame()
 
-    attendance = live_session_attendance.copy()
-    attendance = attendance.rename(columns={"studentId": "userId"})
-
-    assignment_submissions = assignment_submissions.copy()
-    assignment_submissions = assignment_submissions.rename(columns={"studentId": "userId"})
-
-    login_success = login_history[login_history["status"] == "success"].copy()
-
-    rows = []
-    for _, pay in payments.iterrows():
-        user_id = pay.get("userId")
-        paid_at = pay.get("paidAt")
-        if pd.isna(paid_at):
-            continue
-
-        def _count_between(df: pd.DataFrame, time_col: str, start: int, end: int) -> int:
-            mask = (df["userId"] == user_id) & (df[time_col] >= paid_at + pd.Timedelta(days=start)) & (df[time_col] <= paid_at + pd.Timedelta(days=end))
-            return int(mask.sum())
-
-        week1_attendance = _count_between(attendance, "attendedAt", 0, 7)
-        week4_attendance = _count_between(attendance, "attendedAt", 22, 28)
-        week1_submissions = _count_between(assignment_submissions, "submittedAt", 0, 7)
-        week4_submissions = _count_between(assignment_submissions, "submittedAt", 22, 28)
-        week1_logins = _count_between(login_success, "timestamp", 0, 7)
-        week4_logins = _count_between(login_success, "timestamp", 22, 28)
-
-        rows.append(
-            {
-                "userId": user_id,
-                "paidAt": paid_at,
-                "week1_attendance": week1_attendance,
-                "week4_attendance": week4_attendance,
-                "week1_submissions": week1_submissions,
-                "week4_submissions": week4_submissions,
-                "week1_logins": week1_logins,
-                "week4_logins": week4_logins,
-            }
-        )
-
-    return pd.DataFrame(rows)
+    attendance = live_session_attendance.rename(columns={"studentId": "userId"})
+    submissions = assignment_submissions.rename(columns={"studentId": "userId"})
+    login_success = login_history[login_history["status"] == "success"]
+
+    windows = [(0, 7), (22, 28)]
+    user_ids = payments["userId"]
+    paid_at = payments["paidAt"]
+    week1_attendance, week4_attendance = _window_counts(user_ids, paid_at, attendance, "attendedAt", windows)
+    week1_submissions, week4_submissions = _window_counts(user_ids, paid_at, submissions, "submittedAt", windows)
+    week1_logins, week4_logins = _window_counts(user_ids, paid_at, login_success, "timestamp", windows)
+
+    return pd.DataFrame(
+        {
+            "userId": user_ids.to_numpy(),
+            "paidAt": paid_at.to_numpy(),
+            "week1_attendance": week1_attendance,
+            "week4_attendance": week4_attendance,
+            "week1_submissions": week1_submissions,
+            "week4_submissions": week4_submissions,
+            "week1_logins": week1_logins,
+            "week4_logins": week4_logins,
+        }
+    )
 
 
 def agreement_compliance_time(assignments: pd.DataFrame, agreements: pd.DataFrame) -> pd.DataFrame:
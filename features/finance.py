@@ -9,7 +9,7 @@ from analytics.io.loaders import month_start
 def payment_status_by_month(payments: pd.DataFrame) -> pd.DataFrame:
     payments = payments.copy()
     payments["paymentMonth"] = month_start(payments["createdAt"])
-    return payments.groupby(["paymentMonth", "status"], dropna=False)["id"].nunique().reset_index()
+    return payments.groupby(["paymentMonth", "status"], dropna=False, observed=True)["id"].nunique().reset_index()
 
 
 def revenue_by_month(payments: pd.DataFrame) -> pd.DataFrame:
@@ -21,12 +21,12 @@ def revenue_by_month(payments: pd.DataFrame) -> pd.DataFrame:
 def payment_delinquency(payments: pd.DataFrame, max_date: pd.Timestamp) -> pd.DataFrame:
     delinquent = payments[(payments["status"].isin(["pending", "not_paid"])) & (payments["dueDate"].notna())].copy()
     delinquent["isOverdue"] = delinquent["dueDate"] < max_date
-    return delinquent.groupby("status")["id"].nunique().reset_index()
+    return delinquent.groupby("status", observed=True)["id"].nunique().reset_index()
 
 
 def paid_in_full_by_product(payments: pd.DataFrame) -> pd.DataFrame:
     payments = payments.copy()
-    payments["status"] = payments["status"].fillna("unknown")
+    payments["status"] = payments["status"].astype(object).fillna("unknown")
     grouped = payments.groupby(["userId", "productId"], dropna=False)
     summary = grouped.agg(
         succeeded_count=("status", lambda s: (s == "succeeded").sum()),
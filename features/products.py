@@ -88,9 +88,8 @@ def product_performance_matrix(payments: pd.DataFrame, products: pd.DataFrame) -
         revenue=("amount", "sum"),
     ).reset_index()
 
-    merged = revenue.merge(products[["id", "title"]], left_on="productId", right_on="id", how="left")
-    merged = merged.rename(columns={"title": "productTitle"})
-    return merged.drop(columns=["id"], errors="ignore")
+    revenue["productTitle"] = revenue["productId"].map(products.drop_duplicates("id").set_index("id")["title"])
+    return revenue
 
 
 def product_revenue_pareto(payments: pd.DataFrame, products: pd.DataFrame) -> pd.DataFrame:
@@ -102,9 +101,8 @@ def product_revenue_pareto(payments: pd.DataFrame, products: pd.DataFrame) -> pd
     total = revenue["revenue"].sum()
     revenue["cumulative_share"] = revenue["cumulative_revenue"] / total if total else 0
 
-    merged = revenue.merge(products[["id", "title"]], left_on="productId", right_on="id", how="left")
-    merged = merged.rename(columns={"title": "productTitle"})
-    return merged.drop(columns=["id"], errors="ignore")
+    revenue["productTitle"] = revenue["productId"].map(products.drop_duplicates("id").set_index("id")["title"])
+    return revenue.reset_index(drop=True)
 
 
 def module_saturation(modules: pd.DataFrame, module_assigned_users: pd.DataFrame) -> pd.DataFrame:
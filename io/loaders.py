@@ -17,6 +17,9 @@ def to_datetime(df: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
 
 
 def month_start(series: pd.Series) -> pd.Series:
+    # Naive datetimes truncate straight to datetime64[M] in numpy (NaT stays NaT); Period objects are only needed for tz-aware input.
+    if pd.api.types.is_datetime64_dtype(series.dtype):
+        return pd.Series(series.to_numpy().astype("datetime64[M]").astype("datetime64[ns]"), index=series.index, name=series.name)
     return series.dt.to_period("M").dt.to_timestamp()
 
 
@@ -61,6 +64,9 @@ def load_all(data_dir: Path) -> dict[str, pd.DataFrame]:
 
     data["users"] = to_datetime(data["users"], ["createdAt", "updatedAt", "lastActive"])
     data["payments"] = to_datetime(data["payments"], ["createdAt", "updatedAt", "paidAt", "dueDate"])
+    # Payment status has a handful of distinct values; as a categorical, equality checks and
+    # string methods run once per category instead of once per row.
+    data["payments"]["status"] = data["payments"]["status"].astype("category")
     data["payment_commitments"] = to_datetime(data["payment_commitments"], ["createdAt", "paidAt", "updatedAt"])
     data["payment_agreements"] = to_datetime(data["payment_agreements"], ["createdAt", "updatedAt", "signedAt"])
     data["product_accesses"] = to_datetime(data["product_accesses"], ["createdAt", "startDate", "endDate"])
@@ -83,3 +89,17 @@ def load_all(data_dir: Path) -> dict[str, pd.DataFrame]:
     data["user_program_selections"] = to_datetime(data["user_program_selections"], ["createdAt", "updatedAt"])
 
     return data
+
+
+def summarize_catalog(data: dict[str, pd.DataFrame]) -> dict[str, int]:
+    users = data.get("users", pd.DataFrame())
+    categories = data.get("categories", pd.DataFrame())
+    tags = data.get("tags", pd.DataFrame())
+    tag_links = [data.get(name, pd.DataFrame()) for name in ("course_tags", "product_tags", "program_tags")]
+
+    return {
+        "total_users": int(users["id"].nunique()) if not users.empty else 0,
+        "categories": int(categories["name"].nunique()) if not categories.empty else 0,
+        "tags": int(tags["id"].nunique()) if not tags.empty else 0,
+        "tag_assignments": int(sum(len(df) for df in tag_links)),
+    }
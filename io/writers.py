@@ -1,6 +1,13 @@
 ﻿from __future__ import annotations
 
+from functools import lru_cache
+from hashlib import blake2b
 from pathlib import Path
+from typing import Any, Callable
+import inspect
+import os
+import tempfile
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
@@ -14,6 +21,91 @@ def save_table(df: pd.DataFrame, path: Path) -> None:
     df.to_csv(path, index=False)
 
 
+def cached_step(
+    cache_dir: Path,
+    name: str,
+    fn: Callable[..., Any],
+    *args: Any,
+    frame_digests: dict[int, tuple[pd.DataFrame, bytes]] | None = None,
+) -> Any:
+    # Pure table steps are keyed on their inputs' content plus the step's source, so reruns
+    # over unchanged data load the pickled result instead of recomputing it. Pass a shared
+    # frame_digests dict to hash each input frame only once per run.
+    try:
+        key = _step_key(fn, args, frame_digests)
+    except (TypeError, OSError):
+        # Unhashable cells (lists/dicts) or builtins without source: just compute.
+        return fn(*args)
+    path = cache_dir / f"{name}-{key}.pkl"
+    if path.exists():
+        try:
+            return pd.read_pickle(path)
+        except Exception:
+            # Truncated/corrupt entry (interrupted or concurrent run): drop it and recompute.
+            path.unlink(missing_ok=True)
+    result = fn(*args)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=cache_dir, prefix=f".{name}-", suffix=".tmp", delete=False) as tmp:
+        tmp_path = Path(tmp.name)
+    try:
+        pd.to_pickle(result, tmp_path)
+        for stale in cache_dir.glob(f"{name}-*.pkl"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return result
+
+
+# Steps reach beyond their own body (io.loaders helpers, config.constants keyword lists, other
+# features code), so every source file in these packages is part of each cache key.
+STEP_DEPENDENCY_DIRS = ("config", "features", "io")
+
+
+@lru_cache(maxsize=1)
+def _dependency_digest() -> bytes:
+    root = Path(__file__).resolve().parents[1]
+    digest = blake2b(f"pandas={pd.__version__};numpy={np.__version__}".encode("utf-8"), digest_size=16)
+    for path in sorted(p for d in STEP_DEPENDENCY_DIRS for p in (root / d).rglob("*.py")):
+        digest.update(path.relative_to(root).as_posix().encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.digest()
+
+
+def _step_key(
+    fn: Callable[..., Any],
+    args: tuple[Any, ...],
+    frame_digests: dict[int, tuple[pd.DataFrame, bytes]] | None = None,
+) -> str:
+    digest = blake2b(_dependency_digest(), digest_size=16)
+    digest.update(inspect.getsource(fn).encode("utf-8"))
+    for arg in args:
+        if isinstance(arg, pd.DataFrame):
+            digest.update(_frame_digest(arg, frame_digests))
+        else:
+            digest.update(repr(arg).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _frame_digest(frame: pd.DataFrame, frame_digests: dict[int, tuple[pd.DataFrame, bytes]] | None) -> bytes:
+    # The memo keeps a reference to the frame so its id cannot be reused by another object.
+    if frame_digests is not None and id(frame) in frame_digests:
+        return frame_digests[id(frame)][1]
+    digest = blake2b(repr(list(frame.dtypes.astype(str).items())).encode("utf-8"), digest_size=16)
+    digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    # Object cells are hashed via str(), so 1 and "1" collide; add what kind of values each column holds.
+    for col in frame.columns[frame.dtypes == object]:
+        kind = pd.api.types.infer_dtype(frame[col], skipna=False)
+        digest.update(f"{col}:{kind}".encode("utf-8"))
+        if kind.startswith("mixed"):
+            cell_types = frame[col].map(type).astype(str)
+            digest.update(pd.util.hash_pandas_object(cell_types, index=False).to_numpy().tobytes())
+    if frame_digests is not None:
+        frame_digests[id(frame)] = (frame, digest.digest())
+    return digest.digest()
+
+
 def save_fig(fig: plt.Figure, path: Path) -> None:
     fig.tight_layout()
     fig.savefig(path, dpi=150)
@@ -21,7 +113,16 @@ def save_fig(fig: plt.Figure, path: Path) -> None:
 
 
 def md_table(headers: list[str], rows: list[list[str]]) -> str:
-    lines = ["| " + " | ".join(headers) + " |", "| " + " | ".join(["---"] * len(headers)) + " |"]
+    return md_table_body(md_header(tuple(headers)), rows)
+
+
+@lru_cache(maxsize=128)
+def md_header(headers: tuple[str, ...]) -> str:
+    return "| " + " | ".join(headers) + " |\n" + "| " + " | ".join(["---"] * len(headers)) + " |"
+
+
+def md_table_body(header: str, rows: list[list[str]]) -> str:
+    lines = [header]
     for row in rows:
         lines.append("| " + " | ".join(row) + " |")
     return "\n".join(lines)
@@ -30,20 +131,39 @@ def md_table(headers: list[str], rows: list[list[str]]) -> str:
 def fmt_pct(value: float | int | None) -> str:
     if value is None or pd.isna(value):
         return "n/a"
-    return f"{value * 100:.1f}%"
+    # 0.0 and -0.0 share a cache key but format differently, so zeros bypass the cache.
+    return _fmt_pct(value) if value else _format_pct(value)
 
 
 def fmt_num(value: float | int | None) -> str:
     if value is None or pd.isna(value):
         return "n/a"
-    if isinstance(value, float) and value.is_integer():
-        return f"{int(value)}"
-    return f"{value:,.2f}" if isinstance(value, float) else str(value)
+    return _fmt_num(value) if value else _format_num(value)
 
 
 def fmt_int(value: float | int | None) -> str:
     if value is None or pd.isna(value):
         return "n/a"
+    return _fmt_int(value)
+
+
+def _format_pct(value: float | int) -> str:
+    return f"{value * 100:.1f}%"
+
+
+def _format_num(value: float | int) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return f"{int(value)}"
+    return f"{value:,.2f}" if isinstance(value, float) else str(value)
+
+
+# Report tables repeat the same counts/rates heavily; typed=True keeps np.float32 vs float apart.
+_fmt_pct = lru_cache(maxsize=2048, typed=True)(_format_pct)
+_fmt_num = lru_cache(maxsize=2048, typed=True)(_format_num)
+
+
+@lru_cache(maxsize=2048, typed=True)
+def _fmt_int(value: float | int) -> str:
     return f"{int(value)}"
 
 
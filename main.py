@@ -7,7 +7,7 @@ import asyncio
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from analytics.config.settings import get_settings
-from analytics.io.loaders import load_all
+from analytics.io.loaders import load_all, summarize_catalog
 from analytics.models.schema import Context
 from analytics.pipelines.build_tables import build_tables
 from analytics.pipelines.build_figures import build_figures
@@ -19,7 +19,7 @@ from analytics.pipelines.cleanup_outputs import cleanup_outputs
 async def main() -> None:
     settings = get_settings()
     data = load_all(settings.data_dir)
-    ctx = Context(settings=settings, data=data)
+    ctx = Context(settings=settings, data=data, catalog_stats=summarize_catalog(data))
 
     await build_tables(ctx)
     build_figures(ctx)
@@ -1,6 +1,7 @@
 ﻿from __future__ import annotations
 
 from dataclasses import dataclass, field
+import threading
 import pandas as pd
 from typing import Dict
 
@@ -12,9 +13,13 @@ class Context:
     settings: Settings
     data: Dict[str, pd.DataFrame]
     results: Dict[str, pd.DataFrame] = field(default_factory=dict)
+    catalog_stats: Dict[str, int] = field(default_factory=dict)
+    # build_tables registers results from worker threads.
+    _results_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
 
     def add_result(self, name: str, df: pd.DataFrame) -> None:
-        self.results[name] = df
+        with self._results_lock:
+            self.results[name] = df
 
     def get(self, name: str) -> pd.DataFrame:
         return self.results[name]
@@ -22,7 +22,7 @@ def _build_figures(ctx: Context, fig_dir) -> None:
     df = ctx.results.get("enrollments_by_course_month")
     if df is not None and not df.empty:
         label_col = "courseTitle" if "courseTitle" in df.columns else "courseId"
-        totals = df.groupby(label_col)["userId"].sum().sort_values(ascending=False)
+        totals = df.groupby(label_col, observed=True)["userId"].sum().sort_values(ascending=False)
         top5 = totals.head(5).index.tolist()
         plot_df = df[df[label_col].isin(top5)].copy()
         plot_df["enrollmentMonth"] = pd.to_datetime(plot_df["enrollmentMonth"])
@@ -35,7 +35,7 @@ def _build_figures(ctx: Context, fig_dir) -> None:
             VIBRANT_COLORS[1],
             VIBRANT_COLORS[2],
         ]
-        for idx, (course_id, group) in enumerate(plot_df.groupby(label_col)):
+        for idx, (course_id, group) in enumerate(plot_df.groupby(label_col, observed=True)):
             label = str(course_id)[:24]
             color = line_colors[min(idx, len(line_colors) - 1)]
             ax.plot(group["enrollmentMonth"], group["userId"], label=label, color=color)
@@ -59,7 +59,7 @@ def _build_figures(ctx: Context, fig_dir) -> None:
     df = ctx.results.get("enrollments_by_product_month")
     if df is not None and not df.empty:
         label_col = "productTitle" if "productTitle" in df.columns else "productId"
-        totals = df.groupby(label_col)["userId"].sum().sort_values(ascending=False)
+        totals = df.groupby(label_col, observed=True)["userId"].sum().sort_values(ascending=False)
         top5 = totals.head(5).index.tolist()
         plot_df = df[df[label_col].isin(top5)].copy()
         plot_df["enrollmentMonth"] = pd.to_datetime(plot_df["enrollmentMonth"])
@@ -72,7 +72,7 @@ def _build_figures(ctx: Context, fig_dir) -> None:
             VIBRANT_COLORS[1],
             VIBRANT_COLORS[2],
         ]
-        for idx, (product_id, group) in enumerate(plot_df.groupby(label_col)):
+        for idx, (product_id, group) in enumerate(plot_df.groupby(label_col, observed=True)):
             label = str(product_id)[:24]
             color = line_colors[min(idx, len(line_colors) - 1)]
             ax.plot(group["enrollmentMonth"], group["userId"], label=label, color=color)
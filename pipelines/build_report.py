@@ -1,15 +1,30 @@
 from __future__ import annotations
 
+import io
+from functools import lru_cache
+
 import numpy as np
 import pandas as pd
 
+from analytics.io.loaders import summarize_catalog
 from analytics.models.schema import Context
-from analytics.io.writers import md_table, fmt_pct, fmt_num, fmt_int, safe_label
+from analytics.io.writers import md_table, md_table_body, md_header, fmt_pct, fmt_num, fmt_int, safe_label
+
+PROXY_HEADER = md_header(("Course", "Assigned Users", "Assignments", "Any Submission", "All Assignments", "Any Rate", "All Rate"))
+
+
+@lru_cache(maxsize=2048)
+def _clean_label(value: str) -> str:
+    label = safe_label(value, "", default="Unknown")
+    label = "".join(ch for ch in label if ord(ch) < 128)
+    label = " ".join(label.split())
+    return label if label else "Unknown"
 
 
 def build_report(ctx: Context) -> None:
     r = ctx.results
     d = ctx.data
+    catalog_stats = ctx.catalog_stats or summarize_catalog(d)
 
     users = d["users"]
     courses = d["courses"]
@@ -32,7 +47,6 @@ def build_report(ctx: Context) -> None:
     engagement_trends = r.get("engagement_trends_over_time", pd.DataFrame())
     mau = r.get("login_monthly_active", pd.DataFrame())
 
-    payments_status = r.get("payments_status_by_month", pd.DataFrame())
     revenue_waterfall = r.get("revenue_waterfall", pd.DataFrame())
     custom_rev = r.get("custom_product_revenue_by_month", pd.DataFrame())
     payments_received = r.get("payments_received_by_month", pd.DataFrame())
@@ -62,17 +76,20 @@ def build_report(ctx: Context) -> None:
             (session_attendance_rate["assignedCount"] > 0) & (session_attendance_rate["attendedCount"] > 0)
         ].copy()
 
-    categories = d.get("categories", pd.DataFrame())
-    tags = d.get("tags", pd.DataFrame())
-    course_tags = d.get("course_tags", pd.DataFrame())
-    product_tags = d.get("product_tags", pd.DataFrame())
-    program_tags = d.get("program_tags", pd.DataFrame())
-
     def clean_label(value: object) -> str:
-        label = safe_label(value, "", default="Unknown")
-        label = "".join(ch for ch in label if ord(ch) < 128)
-        label = " ".join(label.split())
-        return label if label else "Unknown"
+        # Non-string values always collapse to "Unknown" in safe_label, so only strings hit the cache.
+        return _clean_label(value) if isinstance(value, str) else "Unknown"
+
+    def sum_by(keys: pd.Series, values: pd.Series) -> pd.Series:
+        # Bincount over factorized codes; NaN keys (code -1) are dropped like groupby's default.
+        codes, uniques = pd.factorize(keys, sort=False)
+        valid = codes >= 0
+        totals = np.bincount(codes[valid], weights=values.to_numpy(dtype=float)[valid], minlength=len(uniques))
+        return pd.Series(totals, index=uniques)
+
+    def iter_rows(df: pd.DataFrame, cols: list[str]):
+        # Missing columns come back as NaN, mirroring row.get(col) on iterrows() rows.
+        return df.reindex(columns=cols).itertuples(index=False, name=None)
 
     student_role_ids = set()
     if not roles.empty and "name" in roles.columns:
@@ -86,9 +103,15 @@ def build_report(ctx: Context) -> None:
     lead_users = int(lead_conversion["users"].sum()) if not lead_conversion.empty else 0
     lead_paid = int(lead_conversion["paid_users"].sum()) if not lead_conversion.empty else 0
 
-    pay_status_total = payments_status.groupby("status")["id"].sum().to_dict() if not payments_status.empty else {}
+    # Record and user counts per status share one groupby over the student payments.
+    status_counts = (
+        payments_filtered.groupby("status", sort=False, observed=True).agg(records=("id", "nunique"), users=("userId", "nunique"))
+        if not payments_filtered.empty
+        else pd.DataFrame(columns=["records", "users"])
+    )
+    pay_status_total = status_counts["records"].to_dict()
     pay_user_total = int(payments_filtered["userId"].nunique()) if not payments_filtered.empty else 0
-    pay_users_by_status = payments_filtered.groupby("status")["userId"].nunique().to_dict() if not payments_filtered.empty else {}
+    pay_users_by_status = status_counts["users"].to_dict()
     pending = float(pay_status_total.get("pending", 0))
     not_paid = float(pay_status_total.get("not_paid", 0))
     succeeded = float(pay_status_total.get("succeeded", 0))
@@ -108,8 +131,9 @@ def build_report(ctx: Context) -> None:
     new_face_rate = session_summary["newFaces"].sum() / attended_sum if attended_sum else np.nan
 
     assignment_completion_mean = float(assignment_submission_summary["submissionRate"].mean()) if not assignment_submission_summary.empty else np.nan
-    median_submit_hours = float(time_to_submit["time_to_submit_hours"].median()) if not time_to_submit.empty else np.nan
-    early_submit_share = float((time_to_submit["time_to_submit_hours"] < 0).mean()) if not time_to_submit.empty else np.nan
+    submit_hours = time_to_submit["time_to_submit_hours"].to_numpy(dtype=float) if not time_to_submit.empty else np.empty(0)
+    median_submit_hours = float(np.nanmedian(submit_hours)) if submit_hours.size else np.nan
+    early_submit_share = float(np.count_nonzero(submit_hours < 0) / submit_hours.size) if submit_hours.size else np.nan
 
     attendance_70 = np.nan
     assignments_70 = np.nan
@@ -138,14 +162,14 @@ def build_report(ctx: Context) -> None:
         lead_latest_count = int(latest_row["leadCount"])
         lead_latest_month = pd.to_datetime(latest_row["leadMonth"])
 
-    total_users = int(users["id"].nunique()) if not users.empty else 0
+    total_users = catalog_stats["total_users"]
     conversion_rate = lead_paid / lead_total if lead_total else np.nan
 
     contracted_value = np.nan
     cash_collected = np.nan
     outstanding = np.nan
     if not revenue_waterfall.empty and "stage" in revenue_waterfall.columns:
-        stage_map = dict(zip(revenue_waterfall["stage"].astype(str), revenue_waterfall["amount"].astype(float)))
+        stage_map = revenue_waterfall.set_index(revenue_waterfall["stage"].astype(str))["amount"]
         contracted_value = float(stage_map.get("Contracted Value", np.nan))
         cash_collected = float(stage_map.get("Cash Collected", np.nan))
         if "Outstanding" in stage_map:
@@ -166,9 +190,9 @@ def build_report(ctx: Context) -> None:
     custom_rev_total = float(custom_rev["revenue"].sum()) if not custom_rev.empty else np.nan
     payments_received_total = float(payments_received["payments"].sum()) if not payments_received.empty else np.nan
 
-    total_categories = int(categories["name"].nunique()) if not categories.empty else 0
-    total_tags = int(tags["id"].nunique()) if not tags.empty else 0
-    tag_assignments = int(len(course_tags) + len(product_tags) + len(program_tags))
+    total_categories = catalog_stats["categories"]
+    total_tags = catalog_stats["tags"]
+    tag_assignments = catalog_stats["tag_assignments"]
 
     program_selected_users = int(user_program_selections["userId"].nunique()) if not user_program_selections.empty else 0
     program_selection_rate = program_selected_users / total_users if total_users else np.nan
@@ -176,7 +200,8 @@ def build_report(ctx: Context) -> None:
     if not user_program_selections.empty and "level" in user_program_selections.columns:
         level_counts = user_program_selections["level"].value_counts(dropna=False)
         major = float(level_counts.get("major", 0))
-        total = float(level_counts.sum()) if level_counts.sum() else 0.0
+        # value_counts(dropna=False) covers every row, so the total is just the frame length.
+        total = float(len(user_program_selections))
         program_major_share = major / total if total else np.nan
 
     def fmt_money(value: float | int | None) -> str:
@@ -197,29 +222,17 @@ def build_report(ctx: Context) -> None:
     if not pd.isna(mau_delta):
         mau_label = f"{mau_label} ({fmt_pct(mau_delta)} vs prior month)"
 
-    lines: list[str] = []
-    lines.append("# Babskenky and Company Feb 5th 2026 Report")
-    lines.append("")
-
-    lines.append("## Business Objective")
-    lines.append(
-        "The business objective is to lift learner activation and cash collection by improving live-session attendance, assignment completion, and paid conversion while reducing pending and not-paid exposure."
-    )
-    lines.append("")
-
-    lines.append("## Executive Summary")
-    lines.append(
-        f"Across {fmt_int(total_users)} users and {fmt_int(lead_total)} form inquiries, inquiry to paid conversion is {fmt_pct(conversion_rate)} and the latest monthly active users are {mau_label}, which frames the funnel against current active usage."
+    buf = io.StringIO()
+    buf.write(
+        "# Babskenky and Company Feb 5th 2026 Report\n\n"
+        "## Business Objective\n"
+        "The business objective is to lift learner activation and cash collection by improving live-session attendance, assignment completion, and paid conversion while reducing pending and not-paid exposure.\n\n"
+        "## Executive Summary\n"
+        f"Across {fmt_int(total_users)} users and {fmt_int(lead_total)} form inquiries, inquiry to paid conversion is {fmt_pct(conversion_rate)} and the latest monthly active users are {mau_label}, which frames the funnel against current active usage.\n"
+        f"Overall session attendance is {fmt_pct(overall_att_rate)} with a new-face rate of {fmt_pct(new_face_rate)}, while assignment completion averages {fmt_pct(assignment_completion_mean)} and the median time-to-submit is {fmt_num(median_submit_hours)} hours, which shows engagement is the primary constraint on outcomes.\n"
+        f"Total paid revenue is {fmt_money(total_paid_revenue)} with {fmt_pct(risk_share)} of payments pending or not paid, and the proxy absconded rate is {fmt_pct(absconded_rate)}, which makes cash collection and early activation the most urgent levers.\n\n"
+        "## Executive KPI Summary\n"
     )
-    lines.append(
-        f"Overall session attendance is {fmt_pct(overall_att_rate)} with a new-face rate of {fmt_pct(new_face_rate)}, while assignment completion averages {fmt_pct(assignment_completion_mean)} and the median time-to-submit is {fmt_num(median_submit_hours)} hours, which shows engagement is the primary constraint on outcomes."
-    )
-    lines.append(
-        f"Total paid revenue is {fmt_money(total_paid_revenue)} with {fmt_pct(risk_share)} of payments pending or not paid, and the proxy absconded rate is {fmt_pct(absconded_rate)}, which makes cash collection and early activation the most urgent levers."
-    )
-    lines.append("")
-
-    lines.append("## Executive KPI Summary")
     kpi_rows = [
         ["Total users", fmt_int(total_users)],
         ["Form inquiries", fmt_int(lead_total)],
@@ -235,112 +248,105 @@ def build_report(ctx: Context) -> None:
         ["Pending + not paid share", fmt_pct(risk_share)],
         ["Absconded users (proxy)", f"{fmt_int(absconded_users)} ({fmt_pct(absconded_rate)})"],
     ]
-    lines.append(md_table(["Metric", "Value"], kpi_rows))
-    lines.append("")
-
-    lines.append("## Glossary")
-    lines.append("- Form Inquiry: A person who submitted the intake form and has not necessarily paid.")
-    lines.append("- Intro Session: A short information or interview-prep session that often precedes a core course.")
-    lines.append("")
-
-    lines.append("## Learner Intent and Career Goals")
+    buf.write(
+        md_table(["Metric", "Value"], kpi_rows)
+        + "\n\n"
+        + "## Glossary\n"
+        + "- Form Inquiry: A person who submitted the intake form and has not necessarily paid.\n"
+        + "- Intro Session: A short information or interview-prep session that often precedes a core course.\n\n"
+        + "## Learner Intent and Career Goals\n"
+    )
     if lead_peak_count is not None and lead_latest_count is not None:
-        lines.append(
-            f"Inquiry volume peaked at {fmt_int(lead_peak_count)} in {peak_label} and the latest month recorded {fmt_int(lead_latest_count)}, which shows demand timing and sensitivity to campaign cadence."
+        buf.write(
+            f"Inquiry volume peaked at {fmt_int(lead_peak_count)} in {peak_label} and the latest month recorded {fmt_int(lead_latest_count)}, which shows demand timing and sensitivity to campaign cadence.\n"
         )
-    lines.append(
-        f"Out of {fmt_int(lead_total)} inquiries, {fmt_int(lead_paid)} became paying users ({fmt_pct(conversion_rate)}), and the top intent tags concentrate around the primary motivations shown below, which should guide messaging and follow-up."
+    buf.write(
+        f"Out of {fmt_int(lead_total)} inquiries, {fmt_int(lead_paid)} became paying users ({fmt_pct(conversion_rate)}), and the top intent tags concentrate around the primary motivations shown below, which should guide messaging and follow-up.\n\n"
+        "![Inquiry Volume by Month](output/figures/inquiry_volume_by_month.png)\n"
+        "![Top Inquiry Intent Tags](output/figures/inquiry_intent_tags_ranked.png)\n\n"
     )
-    lines.append("")
-    lines.append("![Inquiry Volume by Month](output/figures/inquiry_volume_by_month.png)")
-    lines.append("![Top Inquiry Intent Tags](output/figures/inquiry_intent_tags_ranked.png)")
-    lines.append("")
 
     if not lead_tags.empty:
-        tag_top = lead_tags.sort_values("leadCount", ascending=False).head(10)
+        tag_top = lead_tags.nlargest(10, "leadCount")
         tag_rows = [
-            [clean_label(row["intentTag"]), fmt_int(row["leadCount"]), fmt_pct(row.get("share"))]
-            for _, row in tag_top.iterrows()
+            [clean_label(tag), fmt_int(count), fmt_pct(share)]
+            for tag, count, share in iter_rows(tag_top, ["intentTag", "leadCount", "share"])
         ]
-        lines.append("### Top Inquiry Intent Tags (Top 10)")
-        lines.append(md_table(["Intent Tag", "Inquiries", "Share"], tag_rows))
-        lines.append("")
+        buf.write(
+            "### Top Inquiry Intent Tags (Top 10)\n"
+            + md_table(["Intent Tag", "Inquiries", "Share"], tag_rows)
+            + "\n\n"
+        )
 
     if not career_goals.empty:
         goal_rows = [
-            [clean_label(row["goalBucket"]), fmt_int(row["count"]), fmt_pct(row.get("share"))]
-            for _, row in career_goals.sort_values("count", ascending=False).iterrows()
+            [clean_label(bucket), fmt_int(count), fmt_pct(share)]
+            for bucket, count, share in iter_rows(career_goals.sort_values("count", ascending=False), ["goalBucket", "count", "share"])
         ]
-        lines.append("### Career Goal Buckets")
-        lines.append(md_table(["Goal Bucket", "Count", "Share"], goal_rows))
-        lines.append("")
-        lines.append("![Career Goal Distribution (Top Buckets)](output/figures/career_goal_distribution.png)")
-        lines.append("")
+        buf.write(
+            "### Career Goal Buckets\n"
+            + md_table(["Goal Bucket", "Count", "Share"], goal_rows)
+            + "\n\n"
+            + "![Career Goal Distribution (Top Buckets)](output/figures/career_goal_distribution.png)\n\n"
+        )
 
-    lines.append("## Attendance and Session Engagement")
+    buf.write("## Attendance and Session Engagement\n")
     total_sessions = (
         int(session_summary.loc[session_summary["assignedCount"] > 0, "liveSessionId"].nunique())
         if not session_summary.empty and "liveSessionId" in session_summary.columns
         else 0
     )
-    lines.append(
-        f"Across {fmt_int(total_sessions)} sessions, the overall attendance rate is {fmt_pct(overall_att_rate)} and the new-face rate is {fmt_pct(new_face_rate)}, which indicates that sessions are under-attended and growth is driven more by repeat attendees than fresh attendance."
-    )
-    lines.append(
-        "The lowest attendance sessions identify the clearest near-term improvement targets, so tightening reminders and repositioning those sessions should lift overall attendance fastest."
+    buf.write(
+        f"Across {fmt_int(total_sessions)} sessions, the overall attendance rate is {fmt_pct(overall_att_rate)} and the new-face rate is {fmt_pct(new_face_rate)}, which indicates that sessions are under-attended and growth is driven more by repeat attendees than fresh attendance.\n"
+        "The lowest attendance sessions identify the clearest near-term improvement targets, so tightening reminders and repositioning those sessions should lift overall attendance fastest.\n\n"
     )
-    lines.append("")
 
     if not session_attendance_rate.empty:
-        low_sessions = session_attendance_rate.sort_values("joinRate").head(10)
+        low_sessions = session_attendance_rate.nsmallest(10, "joinRate")
+        low_cols = ["sessionTitle", "scheduledAt", "assignedCount", "attendedCount", "joinRate", "newFaceRate"]
         low_rows = []
-        for _, row in low_sessions.iterrows():
+        for title, scheduled_at, assigned, attended, join_rate, session_new_face_rate in iter_rows(low_sessions, low_cols):
             low_rows.append(
                 [
-                    clean_label(row.get("sessionTitle")),
-                    fmt_month(row.get("scheduledAt")),
-                    fmt_int(row.get("assignedCount")),
-                    fmt_int(row.get("attendedCount")),
-                    fmt_pct(row.get("joinRate")),
-                    fmt_pct(row.get("newFaceRate")),
+                    clean_label(title),
+                    fmt_month(scheduled_at),
+                    fmt_int(assigned),
+                    fmt_int(attended),
+                    fmt_pct(join_rate),
+                    fmt_pct(session_new_face_rate),
                 ]
             )
-        lines.append("### Lowest Attendance Rate Sessions (Top 10)")
-        lines.append(md_table(["Session", "Date", "Assigned", "Attended", "Attendance Rate", "New-Face Rate"], low_rows))
-        lines.append("")
-
-    lines.append("![Attendance Rate Distribution (Sessions)](output/figures/attendance_rate_distribution.png)")
-    lines.append("")
-    lines.append("![Session Join Rate Over Time](output/figures/session_join_rate_trends.png)")
-    lines.append("")
-
-    lines.append("## Assignment Engagement and Submission Speed")
-    lines.append(
-        f"Average assignment completion is {fmt_pct(assignment_completion_mean)} and the median submission timing is {fmt_num(median_submit_hours)} hours from the baseline, while {fmt_pct(early_submit_share)} of submissions arrive before the baseline, which shows pacing varies and deadlines are not the dominant driver."
+        buf.write(
+            "### Lowest Attendance Rate Sessions (Top 10)\n"
+            + md_table(["Session", "Date", "Assigned", "Attended", "Attendance Rate", "New-Face Rate"], low_rows)
+            + "\n\n"
+        )
+
+    buf.write(
+        "![Attendance Rate Distribution (Sessions)](output/figures/attendance_rate_distribution.png)\n\n"
+        "![Session Join Rate Over Time](output/figures/session_join_rate_trends.png)\n\n"
+        "## Assignment Engagement and Submission Speed\n"
+        f"Average assignment completion is {fmt_pct(assignment_completion_mean)} and the median submission timing is {fmt_num(median_submit_hours)} hours from the baseline, while {fmt_pct(early_submit_share)} of submissions arrive before the baseline, which shows pacing varies and deadlines are not the dominant driver.\n\n"
     )
-    lines.append("")
 
     if not assignment_submission_summary.empty:
-        assn_top = assignment_submission_summary.sort_values("submissions", ascending=False).head(10)
+        assn_top = assignment_submission_summary.nlargest(10, "submissions")
         assn_rows = [
-            [clean_label(row.get("title")), fmt_int(row.get("submissions")), fmt_pct(row.get("submissionRate"))]
-            for _, row in assn_top.iterrows()
+            [clean_label(title), fmt_int(submissions), fmt_pct(rate)]
+            for title, submissions, rate in iter_rows(assn_top, ["title", "submissions", "submissionRate"])
         ]
-        lines.append("### Assignment Completion vs Active Students (Top 10)")
-        lines.append(md_table(["Assignment", "Submitted", "Completion vs Active"], assn_rows))
-        lines.append("")
-
-    lines.append("![Time-to-Submit Distribution (Hours)](output/figures/time_to_submit_distribution.png)")
-    lines.append("")
+        buf.write(
+            "### Assignment Completion vs Active Students (Top 10)\n"
+            + md_table(["Assignment", "Submitted", "Completion vs Active"], assn_rows)
+            + "\n\n"
+        )
 
-    lines.append("## Revenue and Payment Health")
-    lines.append(
-        f"Custom product revenue totals {fmt_money(custom_rev_total)} and paid receipts total {fmt_money(payments_received_total)}, which indicates that booked value is converting to cash but with variability across months."
-    )
-    lines.append(
-        f"Pending and not paid payments represent {fmt_pct(risk_share)} of all transactions, which means collections remain a core operational risk alongside engagement."
+    buf.write(
+        "![Time-to-Submit Distribution (Hours)](output/figures/time_to_submit_distribution.png)\n\n"
+        "## Revenue and Payment Health\n"
+        f"Custom product revenue totals {fmt_money(custom_rev_total)} and paid receipts total {fmt_money(payments_received_total)}, which indicates that booked value is converting to cash but with variability across months.\n"
+        f"Pending and not paid payments represent {fmt_pct(risk_share)} of all transactions, which means collections remain a core operational risk alongside engagement.\n\n"
     )
-    lines.append("")
 
     if pay_status_total:
         status_rows = []
@@ -353,92 +359,90 @@ def build_report(ctx: Context) -> None:
                         fmt_int(pay_users_by_status.get(status)),
                     ]
                 )
-        lines.append("### Payment Status Summary")
-        lines.append(md_table(["Status", "Payment Records", "Unique Users"], status_rows))
-        lines.append("")
+        buf.write(
+            "### Payment Status Summary\n"
+            + md_table(["Status", "Payment Records", "Unique Users"], status_rows)
+            + "\n\n"
+        )
         if pay_user_total:
-            lines.append(
-                f"Payment status counts are based on payment records for Student users only, and {fmt_int(pay_user_total)} unique students have at least one payment record in the system."
+            buf.write(
+                f"Payment status counts are based on payment records for Student users only, and {fmt_int(pay_user_total)} unique students have at least one payment record in the system.\n\n"
             )
-            lines.append("")
 
-    lines.append("![Payments Status by Month](output/figures/payments_status_by_month.png)")
-    lines.append("")
+    buf.write("![Payments Status by Month](output/figures/payments_status_by_month.png)\n\n")
 
     if not revenue_waterfall.empty:
-        lines.append("![Revenue Waterfall](output/figures/revenue_waterfall.png)")
-        lines.append("")
+        buf.write("![Revenue Waterfall](output/figures/revenue_waterfall.png)\n\n")
         if not pd.isna(contracted_value) and not pd.isna(cash_collected):
-            lines.append(
-                f"Contracted value is {fmt_money(contracted_value)}, cash collected is {fmt_money(cash_collected)}, and outstanding value is {fmt_money(outstanding)}, which makes the booked versus collected gap visible at a glance."
+            buf.write(
+                f"Contracted value is {fmt_money(contracted_value)}, cash collected is {fmt_money(cash_collected)}, and outstanding value is {fmt_money(outstanding)}, which makes the booked versus collected gap visible at a glance.\n\n"
             )
-            lines.append("")
 
     if not custom_rev.empty:
-        rows = [[fmt_month(row["revenueMonth"]), fmt_money(row["revenue"])] for _, row in custom_rev.sort_values("revenueMonth").iterrows()]
-        lines.append("### Monthly Custom Product Revenue")
-        lines.append(md_table(["Month", "Revenue"], rows))
-        lines.append("")
-        lines.append("![Custom Product Revenue by Month](output/figures/custom_product_revenue_by_month.png)")
-        lines.append("")
+        rows = [[fmt_month(month), fmt_money(revenue)] for month, revenue in iter_rows(custom_rev.sort_values("revenueMonth"), ["revenueMonth", "revenue"])]
+        buf.write(
+            "### Monthly Custom Product Revenue\n"
+            + md_table(["Month", "Revenue"], rows)
+            + "\n\n"
+            + "![Custom Product Revenue by Month](output/figures/custom_product_revenue_by_month.png)\n\n"
+        )
 
     if not payments_received.empty:
-        rows = [[fmt_month(row["paidMonth"]), fmt_money(row["payments"])] for _, row in payments_received.sort_values("paidMonth").iterrows()]
-        lines.append("### Monthly Payments Received")
-        lines.append(md_table(["Month", "Payments Received"], rows))
-        lines.append("")
-        lines.append("![Payments Received by Month](output/figures/payments_received_by_month.png)")
-        lines.append("")
+        rows = [[fmt_month(month), fmt_money(amount)] for month, amount in iter_rows(payments_received.sort_values("paidMonth"), ["paidMonth", "payments"])]
+        buf.write(
+            "### Monthly Payments Received\n"
+            + md_table(["Month", "Payments Received"], rows)
+            + "\n\n"
+            + "![Payments Received by Month](output/figures/payments_received_by_month.png)\n\n"
+        )
 
     if not paid_revenue_by_product.empty:
         paid_rev = paid_revenue_by_product.copy()
         if not paid_full.empty and "paid_in_full_rate" in paid_full.columns:
             paid_rev = paid_rev.merge(paid_full[["productId", "paid_in_full_rate"]], on="productId", how="left")
-        paid_rev = paid_rev.sort_values("paidRevenue", ascending=False).head(10)
+        paid_rev = paid_rev.nlargest(10, "paidRevenue")
+        paid_rev = paid_rev.assign(productTitle=paid_rev.get("productTitle", paid_rev.get("productId")))
         paid_rows = [
-            [
-                clean_label(row.get("productTitle", row.get("productId"))),
-                fmt_money(row.get("paidRevenue")),
-                fmt_pct(row.get("paid_in_full_rate")),
-            ]
-            for _, row in paid_rev.iterrows()
+            [clean_label(title), fmt_money(revenue), fmt_pct(rate)]
+            for title, revenue, rate in iter_rows(paid_rev, ["productTitle", "paidRevenue", "paid_in_full_rate"])
         ]
-        lines.append("### Top Products by Paid Revenue")
-        lines.append(md_table(["Product", "Paid Revenue", "Fully Paid Rate"], paid_rows))
-        lines.append("")
+        buf.write(
+            "### Top Products by Paid Revenue\n"
+            + md_table(["Product", "Paid Revenue", "Fully Paid Rate"], paid_rows)
+            + "\n\n"
+        )
 
     if not discount_hook.empty:
-        disc = discount_hook.sort_values("discount_share", ascending=False).head(10)
+        disc = discount_hook.nlargest(10, "discount_share")
+        disc = disc.assign(productTitle=disc.get("productTitle", disc.get("productId")))
+        disc_cols = ["productTitle", "discount_sales", "full_sales", "total_sales", "discount_share"]
         disc_rows = [
-            [
-                clean_label(row.get("productTitle", row.get("productId"))),
-                fmt_int(row.get("discount_sales")),
-                fmt_int(row.get("full_sales")),
-                fmt_int(row.get("total_sales")),
-                fmt_pct(row.get("discount_share")),
-            ]
-            for _, row in disc.iterrows()
+            [clean_label(title), fmt_int(discount_sales), fmt_int(full_sales), fmt_int(total_sales), fmt_pct(share)]
+            for title, discount_sales, full_sales, total_sales, share in iter_rows(disc, disc_cols)
         ]
-        lines.append("### Discount Usage Summary")
-        lines.append(md_table(["Product", "Discount Sales", "Full Sales", "Total Sales", "Discount Share"], disc_rows))
-        lines.append("")
+        buf.write(
+            "### Discount Usage Summary\n"
+            + md_table(["Product", "Discount Sales", "Full Sales", "Total Sales", "Discount Share"], disc_rows)
+            + "\n\n"
+        )
         if not disc.empty:
             top_disc = disc.iloc[0]
-            lines.append(
-                f"{clean_label(top_disc.get('productTitle', top_disc.get('productId')))} has the highest discount share at {fmt_pct(top_disc.get('discount_share'))}, which signals pricing sensitivity or a need to sharpen value framing."
+            buf.write(
+                f"{clean_label(top_disc.get('productTitle'))} has the highest discount share at {fmt_pct(top_disc.get('discount_share'))}, which signals pricing sensitivity or a need to sharpen value framing.\n\n"
             )
-            lines.append("")
 
     if not payment_plan_engagement.empty:
         plan_rows = [
-            ["Installment" if bool(row.get("is_installment")) else "Full pay", fmt_int(row.get("users")), fmt_num(row.get("avg_submissions"))]
-            for _, row in payment_plan_engagement.iterrows()
+            ["Installment" if bool(is_installment) else "Full pay", fmt_int(plan_users), fmt_num(avg_submissions)]
+            for is_installment, plan_users, avg_submissions in iter_rows(payment_plan_engagement, ["is_installment", "users", "avg_submissions"])
         ]
-        lines.append("### Payment Plan Engagement")
-        lines.append(md_table(["Plan", "Users", "Avg Submissions"], plan_rows))
-        lines.append("")
+        buf.write(
+            "### Payment Plan Engagement\n"
+            + md_table(["Plan", "Users", "Avg Submissions"], plan_rows)
+            + "\n\n"
+        )
 
-    lines.append("## Agreement Compliance")
+    buf.write("## Agreement Compliance\n")
     if not agreement_dist.empty and "hoursToAgree" in agreement_dist.columns:
         hours = agreement_dist["hoursToAgree"].dropna()
         if not hours.empty:
@@ -448,20 +452,18 @@ def build_report(ctx: Context) -> None:
                 ["75th percentile hours", fmt_num(hours.quantile(0.75))],
                 ["Max hours to agree", fmt_num(hours.max())],
             ]
-            lines.append(
-                f"The median agreement time is {fmt_num(hours.median())} hours and the 75th percentile is {fmt_num(hours.quantile(0.75))} hours, which means a meaningful share of learners take multiple days to accept agreements and this can delay progress."
+            buf.write(
+                f"The median agreement time is {fmt_num(hours.median())} hours and the 75th percentile is {fmt_num(hours.quantile(0.75))} hours, which means a meaningful share of learners take multiple days to accept agreements and this can delay progress.\n\n"
+                + "### Agreement Compliance Summary\n"
+                + md_table(["Metric", "Value"], agreement_rows)
+                + "\n\n"
+                + "![Agreement Compliance Time (Hours)](output/figures/agreement_compliance_time.png)\n\n"
             )
-            lines.append("")
-            lines.append("### Agreement Compliance Summary")
-            lines.append(md_table(["Metric", "Value"], agreement_rows))
-            lines.append("")
-            lines.append("![Agreement Compliance Time (Hours)](output/figures/agreement_compliance_time.png)")
-            lines.append("")
-
-    lines.append("## Learning Engagement (Attendance + Work Submissions)")
+
+    buf.write("## Learning Engagement (Attendance + Work Submissions)\n")
     if not mau.empty:
-        lines.append(
-            f"Monthly active users ended at {fmt_int(mau_last)}, which is {fmt_pct(mau_delta)} versus the prior month, and sustained dips at this level would signal weaker engagement or missed reminders."
+        buf.write(
+            f"Monthly active users ended at {fmt_int(mau_last)}, which is {fmt_pct(mau_delta)} versus the prior month, and sustained dips at this level would signal weaker engagement or missed reminders.\n"
         )
     if not engagement_trends.empty and len(engagement_trends) >= 6:
         trends = engagement_trends.sort_values("month")
@@ -473,220 +475,212 @@ def build_report(ctx: Context) -> None:
         sub_prev = prev3["submissionEvents"].mean()
         att_change = (att_last - att_prev) / att_prev if att_prev else np.nan
         sub_change = (sub_last - sub_prev) / sub_prev if sub_prev else np.nan
-        lines.append(
-            f"The last three months average {fmt_num(att_last)} attendance events and {fmt_num(sub_last)} submission events, which is {fmt_pct(att_change)} and {fmt_pct(sub_change)} versus the prior three months, showing whether engagement is rising or falling together."
+        buf.write(
+            f"The last three months average {fmt_num(att_last)} attendance events and {fmt_num(sub_last)} submission events, which is {fmt_pct(att_change)} and {fmt_pct(sub_change)} versus the prior three months, showing whether engagement is rising or falling together.\n"
         )
-    lines.append("")
-    lines.append("![Monthly Active Users](output/figures/monthly_active_users.png)")
-    lines.append("![Engagement Trends Over Time](output/figures/engagement_trends_over_time.png)")
-    lines.append("")
+    buf.write(
+        "\n"
+        "![Monthly Active Users](output/figures/monthly_active_users.png)\n"
+        "![Engagement Trends Over Time](output/figures/engagement_trends_over_time.png)\n\n"
+    )
 
     if not completion_breakdown.empty:
         comp_rows = [
-            [clean_label(row.get("metric")), fmt_int(row.get("users")), fmt_pct(row.get("rate"))]
-            for _, row in completion_breakdown.iterrows()
+            [clean_label(metric), fmt_int(metric_users), fmt_pct(rate)]
+            for metric, metric_users, rate in iter_rows(completion_breakdown, ["metric", "users", "rate"])
         ]
-        lines.append("### Completion Threshold Breakdown")
-        lines.append(md_table(["Completion Threshold", "Users", "Rate"], comp_rows))
-        lines.append("")
+        buf.write(
+            "### Completion Threshold Breakdown\n"
+            + md_table(["Completion Threshold", "Users", "Rate"], comp_rows)
+            + "\n\n"
+        )
 
     if not course_completion_summary.empty:
-        lines.append("![Completion Rate by Course](output/figures/completion_rate_by_course.png)")
-        lines.append("")
+        buf.write("![Completion Rate by Course](output/figures/completion_rate_by_course.png)\n\n")
 
-    lines.append("## Program and Catalog Strategy")
-    lines.append(
-        f"The updated catalog taxonomy now spans {fmt_int(total_categories)} category types and {fmt_int(total_tags)} tags, with {fmt_int(tag_assignments)} total tag assignments across courses, products, and programs, which provides a clearer structure for discovery and marketing."
-    )
-    lines.append(
-        f"Program selections cover {fmt_int(program_selected_users)} users ({fmt_pct(program_selection_rate)} of the user base), and majors make up {fmt_pct(program_major_share)} of selections, which indicates how focused learners are in their chosen pathways."
+    buf.write(
+        "## Program and Catalog Strategy\n"
+        f"The updated catalog taxonomy now spans {fmt_int(total_categories)} category types and {fmt_int(total_tags)} tags, with {fmt_int(tag_assignments)} total tag assignments across courses, products, and programs, which provides a clearer structure for discovery and marketing.\n"
+        f"Program selections cover {fmt_int(program_selected_users)} users ({fmt_pct(program_selection_rate)} of the user base), and majors make up {fmt_pct(program_major_share)} of selections, which indicates how focused learners are in their chosen pathways.\n\n"
     )
-    lines.append("")
 
     if not program_selection_summary.empty:
-        prog_top = program_selection_summary.sort_values("selected_users", ascending=False).head(10)
+        prog_top = program_selection_summary.nlargest(10, "selected_users")
+        prog_top = prog_top.assign(programTitle=prog_top.get("programTitle", prog_top.get("programId")))
+        prog_cols = ["programTitle", "selected_users", "major_share", "linked_courses", "linked_products"]
         prog_rows = [
-            [
-                clean_label(row.get("programTitle", row.get("programId"))),
-                fmt_int(row.get("selected_users")),
-                fmt_pct(row.get("major_share")),
-                fmt_int(row.get("linked_courses")),
-                fmt_int(row.get("linked_products")),
-            ]
-            for _, row in prog_top.iterrows()
+            [clean_label(title), fmt_int(selected), fmt_pct(major_share), fmt_int(linked_courses), fmt_int(linked_products)]
+            for title, selected, major_share, linked_courses, linked_products in iter_rows(prog_top, prog_cols)
         ]
-        lines.append("### Program Selection Summary (Top 10)")
-        lines.append(md_table(["Program", "Selected Users", "Major Share", "Linked Courses", "Linked Products"], prog_rows))
-        lines.append("")
+        buf.write(
+            "### Program Selection Summary (Top 10)\n"
+            + md_table(["Program", "Selected Users", "Major Share", "Linked Courses", "Linked Products"], prog_rows)
+            + "\n\n"
+        )
 
     if not specialization_tag_revenue.empty:
-        spec_top = specialization_tag_revenue.sort_values("attributed_paid_revenue", ascending=False).head(10)
+        spec_top = specialization_tag_revenue.nlargest(10, "attributed_paid_revenue")
         spec_rows = [
-            [
-                clean_label(row.get("tag")),
-                fmt_money(row.get("attributed_paid_revenue")),
-                fmt_int(row.get("tagged_products")),
-            ]
-            for _, row in spec_top.iterrows()
+            [clean_label(tag), fmt_money(revenue), fmt_int(tagged)]
+            for tag, revenue, tagged in iter_rows(spec_top, ["tag", "attributed_paid_revenue", "tagged_products"])
         ]
-        lines.append("### Specialization Tags by Attributed Paid Revenue (Top 10)")
-        lines.append(md_table(["Specialization Tag", "Attributed Paid Revenue", "Tagged Products"], spec_rows))
-        lines.append("")
+        buf.write(
+            "### Specialization Tags by Attributed Paid Revenue (Top 10)\n"
+            + md_table(["Specialization Tag", "Attributed Paid Revenue", "Tagged Products"], spec_rows)
+            + "\n\n"
+        )
         if not spec_top.empty:
             top_tag = spec_top.iloc[0]
-            lines.append(
-                f"{clean_label(top_tag.get('tag'))} leads specialization-linked paid revenue at {fmt_money(top_tag.get('attributed_paid_revenue'))}, which helps prioritize where revenue-driven positioning is strongest."
+            buf.write(
+                f"{clean_label(top_tag.get('tag'))} leads specialization-linked paid revenue at {fmt_money(top_tag.get('attributed_paid_revenue'))}, which helps prioritize where revenue-driven positioning is strongest.\n\n"
             )
-            lines.append("")
 
     if tag_category_coverage is not None and not tag_category_coverage.empty:
-        lines.append("![Tag Category Coverage by Entity Type](output/figures/tag_category_coverage.png)")
-        lines.append("")
+        buf.write(
+            "![Tag Category Coverage by Entity Type](output/figures/tag_category_coverage.png)\n\n"
+        )
 
-    lines.append("## Course Completion and Product Adoption")
+    buf.write("## Course Completion and Product Adoption\n")
     if not completion_detail.empty:
-        assignments_with_course = assignments.merge(
-            modules[["id", "courseId"]],
-            left_on="moduleId",
-            right_on="id",
-            how="left",
-            suffixes=("", "_module"),
+        course_id_by_module = modules.drop_duplicates("id").set_index("id")["courseId"]
+        assignment_counts = assignments.groupby(assignments["moduleId"].map(course_id_by_module))["id"].nunique()
+        assignment_counts = assignment_counts[assignment_counts > 0].rename("assignments")
+        completion_rate = completion_detail["assignmentCompletionRate"]
+        completion_flags = completion_detail.assign(
+            anySubmitted=(completion_rate > 0).astype(np.int8),
+            allSubmitted=(completion_rate >= 0.999).astype(np.int8),
         )
-        assignment_counts = assignments_with_course.groupby("courseId")["id"].nunique().reset_index().rename(columns={"id": "assignments"})
-        completion_proxy = completion_detail.groupby("courseId").agg(
+        # Each flag column is reduced once; the rates are the sums over the group size rather than a second mean pass.
+        completion_proxy = completion_flags.groupby("courseId").agg(
             assigned_users=("userId", "nunique"),
-            any_submission=("assignmentCompletionRate", lambda s: (s > 0).sum()),
-            all_assignments=("assignmentCompletionRate", lambda s: (s >= 0.999).sum()),
-            any_rate=("assignmentCompletionRate", lambda s: (s > 0).mean()),
-            all_rate=("assignmentCompletionRate", lambda s: (s >= 0.999).mean()),
-        ).reset_index()
-        completion_proxy = completion_proxy.merge(assignment_counts, on="courseId", how="left")
-        completion_proxy = completion_proxy[completion_proxy["assignments"].fillna(0) > 0]
-        completion_proxy = completion_proxy.merge(courses[["id", "title"]], left_on="courseId", right_on="id", how="left")
-        completion_proxy["courseTitle"] = completion_proxy["title"].fillna(completion_proxy["courseId"])
-        completion_proxy = completion_proxy.sort_values("assigned_users", ascending=False).head(10)
+            any_submission=("anySubmitted", "sum"),
+            all_assignments=("allSubmitted", "sum"),
+            detail_rows=("anySubmitted", "size"),
+        )
+        completion_proxy = completion_proxy.assign(
+            any_rate=completion_proxy["any_submission"] / completion_proxy["detail_rows"],
+            all_rate=completion_proxy["all_assignments"] / completion_proxy["detail_rows"],
+        ).drop(columns="detail_rows").reset_index()
+        # Courses without assignments drop out in the inner join; titles are a key -> value map.
+        completion_proxy = completion_proxy.join(assignment_counts, on="courseId", how="inner")
+        course_title_by_id = courses.drop_duplicates("id").set_index("id")["title"]
+        completion_proxy = completion_proxy.assign(
+            courseTitle=completion_proxy["courseId"].map(course_title_by_id).fillna(completion_proxy["courseId"])
+        )
+        completion_proxy = completion_proxy.nlargest(10, "assigned_users")
+        # Format column-wise, then zip the formatted columns back into rows.
         proxy_rows = [
-            [
-                clean_label(row.get("courseTitle"))[:45],
-                fmt_int(row.get("assigned_users")),
-                fmt_int(row.get("assignments")),
-                fmt_int(row.get("any_submission")),
-                fmt_int(row.get("all_assignments")),
-                fmt_pct(row.get("any_rate")),
-                fmt_pct(row.get("all_rate")),
-            ]
-            for _, row in completion_proxy.iterrows()
-        ]
-        lines.append("### Course Completion Summary (Proxy)")
-        lines.append(
-            md_table(
-                ["Course", "Assigned Users", "Assignments", "Any Submission", "All Assignments", "Any Rate", "All Rate"],
-                proxy_rows,
+            list(row)
+            for row in zip(
+                completion_proxy["courseTitle"].map(lambda title: clean_label(title)[:45]),
+                completion_proxy["assigned_users"].map(fmt_int),
+                completion_proxy["assignments"].map(fmt_int),
+                completion_proxy["any_submission"].map(fmt_int),
+                completion_proxy["all_assignments"].map(fmt_int),
+                completion_proxy["any_rate"].map(fmt_pct),
+                completion_proxy["all_rate"].map(fmt_pct),
             )
+        ]
+        buf.write(
+            "### Course Completion Summary (Proxy)\n"
+            + md_table_body(PROXY_HEADER, proxy_rows)
+            + "\n\n"
         )
-        lines.append("")
 
     if not product_adoption_summary.empty:
-        adoption_top = product_adoption_summary.sort_values("unique_users", ascending=False).head(10)
+        adoption_top = product_adoption_summary.nlargest(10, "unique_users")
+        adoption_top = adoption_top.assign(productTitle=adoption_top.get("productTitle", adoption_top.get("productId")))
+        adoption_cols = adoption_top.reindex(columns=["productTitle", "unique_users", "active_users", "adoption_rate"])
         adoption_rows = [
-            [
-                clean_label(row.get("productTitle", row.get("productId"))),
-                fmt_int(row.get("unique_users")),
-                fmt_int(row.get("active_users")),
-                fmt_pct(row.get("adoption_rate")),
-            ]
-            for _, row in adoption_top.iterrows()
+            list(row)
+            for row in zip(
+                adoption_cols["productTitle"].map(clean_label),
+                adoption_cols["unique_users"].map(fmt_int),
+                adoption_cols["active_users"].map(fmt_int),
+                adoption_cols["adoption_rate"].map(fmt_pct),
+            )
         ]
-        lines.append("### Product Adoption (Top 10)")
-        lines.append(md_table(["Product", "Unique Users", "Active Users", "Adoption Rate"], adoption_rows))
-        lines.append("")
-        lines.append("![Product Adoption (Top 12)](output/figures/product_adoption_top12.png)")
-        lines.append("")
+        buf.write(
+            "### Product Adoption (Top 10)\n"
+            + md_table(["Product", "Unique Users", "Active Users", "Adoption Rate"], adoption_rows)
+            + "\n\n"
+            + "![Product Adoption (Top 12)](output/figures/product_adoption_top12.png)\n\n"
+        )
 
-    lines.append("## Product Strategy and Enrollments")
+    buf.write("## Product Strategy and Enrollments\n")
     if not enrollments_by_course_month.empty:
-        course_totals = enrollments_by_course_month.groupby("courseTitle")["userId"].sum().sort_values(ascending=False)
-        course_share = course_totals.head(5).sum() / course_totals.sum() if course_totals.sum() else np.nan
-        lines.append(
-            f"The top five courses account for {fmt_pct(course_share)} of enrollments, so improving onboarding and retention in those courses will move outcomes fastest."
+        course_totals = sum_by(enrollments_by_course_month["courseTitle"], enrollments_by_course_month["userId"])
+        course_total = float(course_totals.sum())
+        course_share = course_totals.nlargest(5).sum() / course_total if course_total else np.nan
+        buf.write(
+            f"The top five courses account for {fmt_pct(course_share)} of enrollments, so improving onboarding and retention in those courses will move outcomes fastest.\n"
         )
     if not enrollments_by_product_month.empty:
-        product_totals = enrollments_by_product_month.groupby("productTitle")["userId"].sum().sort_values(ascending=False)
-        product_share = product_totals.head(5).sum() / product_totals.sum() if product_totals.sum() else np.nan
-        lines.append(
-            f"The top five products account for {fmt_pct(product_share)} of enrollments, which reinforces the focus on a small set of offerings." 
+        product_totals = sum_by(enrollments_by_product_month["productTitle"], enrollments_by_product_month["userId"])
+        product_total = float(product_totals.sum())
+        product_share = product_totals.nlargest(5).sum() / product_total if product_total else np.nan
+        buf.write(
+            f"The top five products account for {fmt_pct(product_share)} of enrollments, which reinforces the focus on a small set of offerings.\n"
         )
-    lines.append("")
-    lines.append("![Top-5 Course Enrollments](output/figures/enrollments_top5_courses.png)")
-    lines.append("![Top-5 Product Enrollments](output/figures/enrollments_top5_products.png)")
-    lines.append("")
+    buf.write(
+        "\n"
+        "![Top-5 Course Enrollments](output/figures/enrollments_top5_courses.png)\n"
+        "![Top-5 Product Enrollments](output/figures/enrollments_top5_products.png)\n\n"
+    )
 
     if not pareto.empty:
-        lines.append("![Revenue Concentration (Pareto)](output/figures/product_revenue_pareto.png)")
-        lines.append("")
+        buf.write("![Revenue Concentration (Pareto)](output/figures/product_revenue_pareto.png)\n\n")
         if "cumulative_share" in pareto.columns:
-            try:
-                k = int((pareto["cumulative_share"] >= 0.8).idxmax()) + 1
-                lines.append(
-                    f"Roughly {fmt_int(k)} products drive about 80% of revenue, which means protecting and improving these products is the fastest lever for revenue stability."
+            # cumulative_share is monotonic (products are sorted by revenue), so bisect for the 80% crossing.
+            cumulative_share = pareto["cumulative_share"].to_numpy(dtype=float)
+            if cumulative_share.size and cumulative_share[-1] >= 0.8:
+                k = int(np.searchsorted(cumulative_share, 0.8, side="left")) + 1
+                buf.write(
+                    f"Roughly {fmt_int(k)} products drive about 80% of revenue, which means protecting and improving these products is the fastest lever for revenue stability.\n"
                 )
-            except Exception:
-                lines.append(
-                    "Revenue is concentrated in a small number of products, which means protecting those products should be a priority for stability."
+            else:
+                buf.write(
+                    "Revenue is concentrated in a small number of products, which means protecting those products should be a priority for stability.\n"
                 )
-            lines.append("")
+            buf.write("\n")
 
-    lines.append("## Sales Velocity")
+    buf.write("## Sales Velocity\n")
     if not sales_lag.empty and "salesLagDays" in sales_lag.columns:
         lag = sales_lag["salesLagDays"].dropna()
         if not lag.empty:
-            lines.append(
-                f"Average sales lag is {fmt_num(lag.mean())} days and the median is {fmt_num(lag.median())} days, which shows that the form-to-payment cycle remains longer than ideal."
+            buf.write(
+                f"Average sales lag is {fmt_num(lag.mean())} days and the median is {fmt_num(lag.median())} days, which shows that the form-to-payment cycle remains longer than ideal.\n\n"
+                "![Sales Lag (Histogram)](output/figures/sales_lag_hist.png)\n\n"
             )
-            lines.append("")
-            lines.append("![Sales Lag (Histogram)](output/figures/sales_lag_hist.png)")
-            lines.append("")
 
-    lines.append("## Revenue Leakage and Operational Risks")
+    buf.write("## Revenue Leakage and Operational Risks\n")
     if not ops_gaps.empty:
         gap_df = ops_gaps.rename(columns={"gapType": "gap", "userCount": "users", "notes": "meaning"})
+        gap_cols = gap_df.reindex(columns=["gap", "users", "meaning"])
         gap_rows = [
-            [clean_label(row.get("gap")), fmt_int(row.get("users")), clean_label(row.get("meaning"))]
-            for _, row in gap_df.iterrows()
+            list(row)
+            for row in zip(gap_cols["gap"].map(clean_label), gap_cols["users"].map(fmt_int), gap_cols["meaning"].map(clean_label))
         ]
-        lines.append(md_table(["Gap", "Users", "Meaning"], gap_rows))
-        lines.append("")
+        buf.write(md_table(["Gap", "Users", "Meaning"], gap_rows) + "\n\n")
         if "users" in gap_df.columns and not gap_df.empty:
-            top_gap = gap_df.sort_values("users", ascending=False).iloc[0]
-            lines.append(
-                f"The largest operational gap is {clean_label(top_gap.get('gap'))} affecting {fmt_int(top_gap.get('users'))} users, which signals immediate leakage risk that can be addressed with tighter enrollment and payment reconciliation."
+            top_gap = gap_df.loc[gap_df["users"].idxmax()]
+            buf.write(
+                f"The largest operational gap is {clean_label(top_gap.get('gap'))} affecting {fmt_int(top_gap.get('users'))} users, which signals immediate leakage risk that can be addressed with tighter enrollment and payment reconciliation.\n\n"
             )
-            lines.append("")
-        lines.append(
-            "Exceptions and mismatched access/payment are direct revenue leakage, so tightening these controls is the fastest way to reduce losses without changing the product."
+        buf.write(
+            "Exceptions and mismatched access/payment are direct revenue leakage, so tightening these controls is the fastest way to reduce losses without changing the product.\n\n"
         )
-        lines.append("")
 
-    lines.append("## Relationships and Drivers")
-    lines.append(
-        "Sales velocity, early activation, and session engagement quality appear tightly linked, because longer form-to-payment lag reduces conversion, weaker attendance and submissions reduce completion, and low new-face rates indicate recycling the same attendees rather than expanding reach."
-    )
-    lines.append(
-        "Improving any one of these areas tends to lift the others, so faster follow-up, stronger onboarding, and clearer session positioning should collectively raise conversion, engagement, and cash collection."
-    )
-    lines.append("")
-
-    lines.append("## Summary and Overall Health")
-    lines.append(
-        f"Business health is mixed, with {fmt_pct(risk_share)} pending or not paid share, strict completion at {fmt_pct(strict_completion)}, and an absconded rate of {fmt_pct(absconded_rate)}, which means revenue is being booked without full collection and many learners disengage before completing."
-    )
-    lines.append(
-        "Coverage is strongest for payments, sessions, and inquiries, while strict completion depends on both attendance and assignment data and should be read as a lower bound until validated against manual completion records."
-    )
-    lines.append(
-        "The business is generating interest but losing momentum across sales velocity and early engagement, so tightening follow-up speed, improving session activation, and enforcing payment compliance should lift conversion, cash collection, and completion together."
+    buf.write(
+        "## Relationships and Drivers\n"
+        "Sales velocity, early activation, and session engagement quality appear tightly linked, because longer form-to-payment lag reduces conversion, weaker attendance and submissions reduce completion, and low new-face rates indicate recycling the same attendees rather than expanding reach.\n"
+        "Improving any one of these areas tends to lift the others, so faster follow-up, stronger onboarding, and clearer session positioning should collectively raise conversion, engagement, and cash collection.\n\n"
+        "## Summary and Overall Health\n"
+        f"Business health is mixed, with {fmt_pct(risk_share)} pending or not paid share, strict completion at {fmt_pct(strict_completion)}, and an absconded rate of {fmt_pct(absconded_rate)}, which means revenue is being booked without full collection and many learners disengage before completing.\n"
+        "Coverage is strongest for payments, sessions, and inquiries, while strict completion depends on both attendance and assignment data and should be read as a lower bound until validated against manual completion records.\n"
+        "The business is generating interest but losing momentum across sales velocity and early engagement, so tightening follow-up speed, improving session activation, and enforcing payment compliance should lift conversion, cash collection, and completion together.\n"
     )
-    lines.append("")
 
     report_path = ctx.settings.base_dir / "report.md"
-    report_path.write_text("\n".join(lines), encoding="utf-8")
+    # Encode once and write raw bytes; skips the text-mode encoder/newline layer (output is always LF).
+    report_path.write_bytes(buf.getvalue().encode("utf-8"))
@@ -1,10 +1,15 @@
 ﻿from __future__ import annotations
 
+import asyncio
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pandas as pd
 
-from analytics.io.loaders import month_start
-from analytics.io.writers import ensure_dirs, save_table
+from analytics.io.loaders import month_start, summarize_catalog
+from analytics.io.writers import cached_step, ensure_dirs, save_table
 from analytics.models.schema import Context
 from analytics.features.lead_nlp import parse_form_submissions, extract_skill_gap_llm
 from analytics.features.engagement import (
@@ -42,9 +47,48 @@ from analytics.features.ops import (
 from analytics.features.gateway_attribution import classify_gateway_sessions
 
 
+GOAL_BUCKET_PATTERNS = {
+    bucket: re.compile("|".join(re.escape(key) for key in keys))
+    for bucket, keys in {
+        "data science/analytics": ["data science", "data scientist", "data analyst", "analytics"],
+        "salesforce": ["salesforce", "admin", "administrator", "crm"],
+        "business analysis": ["business analyst", "business analysis", "ba"],
+        "product management": ["product manager", "product management", "product owner"],
+        "cloud/devops": ["cloud", "devops", "aws", "azure", "gcp"],
+        "cybersecurity": ["cyber", "security", "infosec"],
+        "scrum/agile": ["scrum", "agile", "scrum master"],
+        "software engineering": ["software", "developer", "engineer", "programmer"],
+    }.items()
+}
+
+
+def _categorize(df: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
+    # Low-cardinality string keys: categorical codes make the equality filters and groupbys integer ops.
+    present = [col for col in cols if col in df.columns]
+    return df.astype({col: "category" for col in present}) if present else df
+
+
+def _nunique_by(df: pd.DataFrame, keys: str | list[str], col: str, dropna: bool = True) -> pd.Series:
+    # Same result as groupby(keys)[col].nunique(): dedupe (keys, col) pairs once, then count non-null values per group.
+    keys = [keys] if isinstance(keys, str) else list(keys)
+    pairs = df.drop_duplicates(subset=[*keys, col])
+    return pairs[col].notna().groupby([pairs[key] for key in keys], dropna=dropna, observed=True).sum().rename(col)
+
+
+def _hours_between(end: pd.Series, start: pd.Series) -> np.ndarray:
+    # Subtract the int64 ns views directly instead of materialising a Timedelta series first.
+    end_ns = end.to_numpy(dtype="datetime64[ns]")
+    start_ns = start.to_numpy(dtype="datetime64[ns]")
+    hours = (end_ns.view("i8") - start_ns.view("i8")) / 1e9
+    hours /= 3600
+    hours[np.isnat(end_ns) | np.isnat(start_ns)] = np.nan
+    return hours
+
+
 async def build_tables(ctx: Context) -> None:
     settings = ctx.settings
     data = ctx.data
+    catalog_stats = ctx.catalog_stats or summarize_catalog(data)
 
     ensure_dirs(settings.table_dir, settings.fig_dir)
 
@@ -88,15 +132,26 @@ async def build_tables(ctx: Context) -> None:
     student_ids = set(users[users["roleId"].isin(student_role_ids)]["id"].tolist()) if not users.empty else set()
 
     # Filter payment-related datasets to student users only (exclude admin/test activity).
+    # The Index keeps its hash table, so all five lookups reuse one build instead of rehashing the id set per isin.
     if student_ids:
-        payments = payments[payments["userId"].isin(student_ids)].copy()
-        payment_commitments = payment_commitments[payment_commitments["userId"].isin(student_ids)].copy()
-        payment_agreements = payment_agreements[payment_agreements["userId"].isin(student_ids)].copy()
-        payment_exceptions = payment_exceptions[payment_exceptions["userId"].isin(student_ids)].copy()
-        custom_products = custom_products[custom_products["userId"].isin(student_ids)].copy()
+        student_index = pd.Index(list(student_ids))
+        payments = payments[student_index.get_indexer(payments["userId"]) >= 0]
+        payment_commitments = payment_commitments[student_index.get_indexer(payment_commitments["userId"]) >= 0]
+        payment_agreements = payment_agreements[student_index.get_indexer(payment_agreements["userId"]) >= 0]
+        payment_exceptions = payment_exceptions[student_index.get_indexer(payment_exceptions["userId"]) >= 0]
+        custom_products = custom_products[student_index.get_indexer(custom_products["userId"]) >= 0]
+
+    login_history = _categorize(login_history, ["status"])
 
-    course_titles = courses[["id", "title"]].rename(columns={"id": "courseId", "title": "courseTitle"})
-    product_titles = products[["id", "title", "price", "discountPrice"]].rename(columns={"id": "productId", "title": "productTitle"})
+    # Paid (paidAt set or succeeded in any casing) and strictly succeeded payments are reused across sections.
+    paid = payments[payments["paidAt"].notna() | (payments["status"].str.lower() == "succeeded")]
+    succeeded_payments = payments[payments["status"] == "succeeded"]
+    paid_revenue_by_product = paid.groupby("productId")["amount"].sum().rename("paidRevenue")
+
+    # Title catalogs are indexed by their key so summaries can .join them instead of merging.
+    course_titles = courses[["id", "title"]].rename(columns={"id": "courseId", "title": "courseTitle"}).set_index("courseId")
+    product_titles = products[["id", "title", "price", "discountPrice"]].rename(columns={"id": "productId", "title": "productTitle"}).set_index("productId")
+    assignment_titles = assignments.drop_duplicates("id").set_index("id")["title"]
 
     course_products = course_product_map(product_assets)
     enrollments = product_accesses.merge(course_products, on="productId", how="left")
@@ -104,35 +159,42 @@ async def build_tables(ctx: Context) -> None:
 
     # Adoption
     enrollments["enrollmentMonth"] = month_start(enrollments["enrollmentDate"])
-    enrollments_by_course_month = enrollments.groupby(["courseId", "enrollmentMonth"], dropna=False)["userId"].nunique().reset_index()
-    enrollments_by_course_month = enrollments_by_course_month.merge(course_titles, on="courseId", how="left")
+    # Per-month unique counts fit in int32; the narrower column halves the bytes scanned by downstream groupby sums.
+    enrollments_by_course_month = _nunique_by(enrollments, ["courseId", "enrollmentMonth"], "userId", dropna=False).astype(np.int32).reset_index()
+    enrollments_by_course_month = enrollments_by_course_month.join(course_titles, on="courseId", how="left")
+    # Titles are categorical so the report/figure groupbys work on integer codes instead of hashing strings.
     if "courseTitle" in enrollments_by_course_month.columns:
         enrollments_by_course_month = enrollments_by_course_month[["courseTitle", "courseId", "enrollmentMonth", "userId"]]
+        enrollments_by_course_month["courseTitle"] = enrollments_by_course_month["courseTitle"].astype("category")
     save_table(enrollments_by_course_month, settings.table_dir / "enrollments_by_course_month.csv")
     ctx.add_result("enrollments_by_course_month", enrollments_by_course_month)
 
-    enrollments_by_product_month = enrollments.groupby(["productId", "enrollmentMonth"], dropna=False)["userId"].nunique().reset_index()
-    enrollments_by_product_month = enrollments_by_product_month.merge(product_titles, on="productId", how="left")
+    enrollments_by_product_month = _nunique_by(enrollments, ["productId", "enrollmentMonth"], "userId", dropna=False).astype(np.int32).reset_index()
+    enrollments_by_product_month = enrollments_by_product_month.join(product_titles, on="productId", how="left")
     if "productTitle" in enrollments_by_product_month.columns:
         enrollments_by_product_month = enrollments_by_product_month[["productTitle", "productId", "enrollmentMonth", "userId", "price", "discountPrice"]]
+        enrollments_by_product_month["productTitle"] = enrollments_by_product_month["productTitle"].astype("category")
     save_table(enrollments_by_product_month, settings.table_dir / "enrollments_by_product_month.csv")
     ctx.add_result("enrollments_by_product_month", enrollments_by_product_month)
 
-    total_users = users["id"].nunique() if not users.empty else 0
-    adoption_summary = product_accesses.groupby("productId").agg(
-        unique_users=("userId", "nunique"),
-        active_users=("isActive", lambda s: (s == 1).sum()),
+    total_users = catalog_stats["total_users"]
+    # Active users come from a plain boolean sum per product rather than a per-group lambda.
+    adoption_summary = pd.DataFrame(
+        {
+            "unique_users": _nunique_by(product_accesses, "productId", "userId"),
+            "active_users": (product_accesses["isActive"] == 1).groupby(product_accesses["productId"]).sum(),
+        }
     ).reset_index()
     adoption_summary["adoption_rate"] = adoption_summary["unique_users"] / total_users if total_users else np.nan
-    adoption_summary = adoption_summary.merge(product_titles, on="productId", how="left")
+    adoption_summary = adoption_summary.join(product_titles, on="productId", how="left")
     save_table(adoption_summary, settings.table_dir / "product_adoption_summary.csv")
     ctx.add_result("product_adoption_summary", adoption_summary)
 
     # Program selection and catalog taxonomy
-    program_titles = programs[["id", "title"]].rename(columns={"id": "programId", "title": "programTitle"})
-    program_selection = user_program_selections.copy()
+    program_titles = programs[["id", "title"]].rename(columns={"id": "programId", "title": "programTitle"}).set_index("programId")
+    program_selection = user_program_selections
     if not program_selection.empty:
-        level_counts = program_selection.groupby(["programId", "level"])["userId"].nunique().unstack(fill_value=0)
+        level_counts = _nunique_by(program_selection, ["programId", "level"], "userId").unstack(fill_value=0)
         level_counts["major_users"] = level_counts.get("major", 0)
         level_counts["minor_users"] = level_counts.get("minor", 0)
         level_counts["selected_users"] = level_counts["major_users"] + level_counts["minor_users"]
@@ -140,12 +202,12 @@ async def build_tables(ctx: Context) -> None:
     else:
         level_counts = pd.DataFrame(columns=["programId", "major_users", "minor_users", "selected_users"])
 
-    courses_per_program = program_courses.groupby("programId")["courseId"].nunique().rename("linked_courses").reset_index()
-    products_per_program = product_programs.groupby("programId")["productId"].nunique().rename("linked_products").reset_index()
+    courses_per_program = _nunique_by(program_courses, "programId", "courseId").rename("linked_courses").reset_index()
+    products_per_program = _nunique_by(product_programs, "programId", "productId").rename("linked_products").reset_index()
 
     program_summary = level_counts.merge(courses_per_program, on="programId", how="left")
     program_summary = program_summary.merge(products_per_program, on="programId", how="left")
-    program_summary = program_summary.merge(program_titles, on="programId", how="left")
+    program_summary = program_summary.join(program_titles, on="programId", how="left")
     program_summary["linked_courses"] = program_summary["linked_courses"].fillna(0)
     program_summary["linked_products"] = program_summary["linked_products"].fillna(0)
     program_summary["major_share"] = program_summary["major_users"] / program_summary["selected_users"].replace(0, np.nan)
@@ -159,7 +221,7 @@ async def build_tables(ctx: Context) -> None:
         if entity_tags.empty:
             return pd.DataFrame(columns=["category", "entities", "entityType"])
         merged = entity_tags.merge(tag_categories[["id", "name"]], left_on="tagId", right_on="id", how="left")
-        coverage = merged.groupby("name")[entity_col].nunique().reset_index().rename(columns={"name": "category", entity_col: "entities"})
+        coverage = _nunique_by(merged, "name", entity_col).reset_index().rename(columns={"name": "category", entity_col: "entities"})
         coverage["entityType"] = entity_type
         return coverage
 
@@ -183,13 +245,10 @@ async def build_tables(ctx: Context) -> None:
 
     if not spec_tags.empty:
         spec_map = product_tags.merge(spec_tags, left_on="tagId", right_on="id", how="left").dropna(subset=["name"])
-        tag_counts = spec_map.groupby("productId")["tagId"].nunique().rename("tag_count").reset_index()
-        paid = payments[(payments["paidAt"].notna()) | (payments["status"].str.lower() == "succeeded")].copy()
-        paid_revenue = paid.groupby("productId")["amount"].sum().reset_index().rename(columns={"amount": "paidRevenue"})
-        paid_revenue = paid_revenue.merge(tag_counts, on="productId", how="left")
-        paid_revenue["tag_count"] = paid_revenue["tag_count"].replace(0, np.nan)
-        paid_revenue["rev_per_tag"] = paid_revenue["paidRevenue"] / paid_revenue["tag_count"]
-        spec_map = spec_map.merge(paid_revenue[["productId", "rev_per_tag"]], on="productId", how="left")
+        # Both per-product Series share the productId index, so the split stays index-aligned until the final join.
+        tag_counts = _nunique_by(spec_map, "productId", "tagId")
+        rev_per_tag = (paid_revenue_by_product / tag_counts.replace(0, np.nan)).rename("rev_per_tag")
+        spec_map = spec_map.join(rev_per_tag, on="productId", how="left")
         spec_rev = spec_map.groupby("name").agg(
             attributed_paid_revenue=("rev_per_tag", "sum"),
             tagged_products=("productId", "nunique"),
@@ -208,58 +267,50 @@ async def build_tables(ctx: Context) -> None:
     save_table(revenue, settings.table_dir / "revenue_by_month.csv")
     ctx.add_result("revenue_by_month", revenue)
 
-    custom_rev = custom_products.dropna(subset=["createdAt"]).copy()
+    custom_rev = custom_products.dropna(subset=["createdAt"])
     if not custom_rev.empty:
-        custom_rev["revenueMonth"] = month_start(custom_rev["createdAt"])
-        custom_rev = custom_rev.groupby("revenueMonth")["totalPrice"].sum().reset_index().rename(columns={"totalPrice": "revenue"})
+        custom_rev = custom_rev.groupby(month_start(custom_rev["createdAt"]).rename("revenueMonth"))["totalPrice"].sum().reset_index().rename(columns={"totalPrice": "revenue"})
     else:
         custom_rev = pd.DataFrame(columns=["revenueMonth", "revenue"])
     save_table(custom_rev, settings.table_dir / "custom_product_revenue_by_month.csv")
     ctx.add_result("custom_product_revenue_by_month", custom_rev)
 
-    paid = payments[(payments["paidAt"].notna()) | (payments["status"].str.lower() == "succeeded")].copy()
     if not paid.empty:
-        paid["paidMonth"] = month_start(paid["paidAt"].fillna(paid["createdAt"]))
-        payments_received = paid.groupby("paidMonth")["amount"].sum().reset_index().rename(columns={"amount": "payments"})
+        paid_month = month_start(paid["paidAt"].fillna(paid["createdAt"])).rename("paidMonth")
+        payments_received = paid.groupby(paid_month)["amount"].sum().reset_index().rename(columns={"amount": "payments"})
     else:
         payments_received = pd.DataFrame(columns=["paidMonth", "payments"])
     save_table(payments_received, settings.table_dir / "payments_received_by_month.csv")
     ctx.add_result("payments_received_by_month", payments_received)
 
-    paid_revenue = paid.groupby("productId")["amount"].sum().reset_index().rename(columns={"amount": "paidRevenue"})
-    paid_revenue = paid_revenue.merge(product_titles, on="productId", how="left")
+    paid_revenue = paid_revenue_by_product.reset_index().join(product_titles, on="productId", how="left")
     save_table(paid_revenue, settings.table_dir / "paid_revenue_by_product.csv")
     ctx.add_result("paid_revenue_by_product", paid_revenue)
 
-    max_date = max(
-        payments["createdAt"].max(),
-        login_history["timestamp"].max(),
-        product_accesses["createdAt"].max(),
-        live_session_attendance["attendedAt"].max() if "attendedAt" in live_session_attendance else pd.Timestamp.min,
+    # Reduce int64 views in numpy: NaT is the smallest int64, so it never wins the max.
+    date_cols = [payments["createdAt"], login_history["timestamp"], product_accesses["createdAt"]]
+    if "attendedAt" in live_session_attendance:
+        date_cols.append(live_session_attendance["attendedAt"])
+    max_date = pd.Timestamp(
+        max(col.to_numpy(dtype="datetime64[ns]").view("i8").max(initial=np.iinfo(np.int64).min) for col in date_cols)
     )
     delinquency = payment_delinquency(payments, max_date)
     save_table(delinquency, settings.table_dir / "payment_delinquency.csv")
     ctx.add_result("payment_delinquency", delinquency)
 
-    paid_in_full = paid_in_full_by_product(payments).merge(product_titles, on="productId", how="left")
+    paid_in_full = paid_in_full_by_product(payments).join(product_titles, on="productId", how="left")
     save_table(paid_in_full, settings.table_dir / "paid_in_full_by_product.csv")
     ctx.add_result("paid_in_full_by_product", paid_in_full)
 
     # Completion and attendance
     assignment_completion, assignments_with_course = build_assignment_completion(assignments, assignment_submissions, modules)
-    assignment_completion_by_course = assignment_completion.groupby("courseId")["assignmentCompletionRate"].mean().reset_index().merge(course_titles, on="courseId", how="left")
+    assignment_completion_by_course = assignment_completion.groupby("courseId")["assignmentCompletionRate"].mean().reset_index().join(course_titles, on="courseId", how="left")
     save_table(assignment_completion_by_course, settings.table_dir / "assignment_completion_by_course.csv")
     ctx.add_result("assignment_completion_by_course", assignment_completion_by_course)
 
     attendance, session_new_faces = build_attendance(live_session_assigned, live_session_attendance, live_sessions)
-    session_titles = live_sessions.rename(columns={"id": "liveSessionId", "title": "sessionTitle"})[["liveSessionId", "sessionTitle", "scheduledAt", "createdById"]]
-    session_new_faces = session_new_faces.merge(session_titles, on="liveSessionId", how="left")
-    # Normalize scheduledAt column
-    if "scheduledAt" not in session_new_faces.columns:
-        if "scheduledAt_y" in session_new_faces.columns:
-            session_new_faces["scheduledAt"] = session_new_faces["scheduledAt_y"]
-        elif "scheduledAt_x" in session_new_faces.columns:
-            session_new_faces["scheduledAt"] = session_new_faces["scheduledAt_x"]
+    # build_attendance starts from live_sessions, so title/scheduledAt are already on every row; no re-join needed.
+    session_new_faces = session_new_faces.rename(columns={"title": "sessionTitle"})
     # Clean up columns for exec-friendly table
     session_summary_clean = session_new_faces[
         [
@@ -277,25 +328,28 @@ async def build_tables(ctx: Context) -> None:
     ctx.add_result("session_attendance_summary", session_summary_clean)
 
     # Engagement trends over time (attendance + submissions)
-    att = live_session_attendance.copy()
-    att["attendMonth"] = month_start(att["attendedAt"])
-    att_month = att.groupby("attendMonth")["id"].nunique().reset_index().rename(columns={"id": "attendanceEvents"})
-
-    subs = assignment_submissions.copy()
-    subs["submitMonth"] = month_start(subs["submittedAt"])
-    subs_month = subs.groupby("submitMonth")["id"].nunique().reset_index().rename(columns={"id": "submissionEvents"})
-
-    engagement_trends = att_month.merge(subs_month, left_on="attendMonth", right_on="submitMonth", how="outer")
-    engagement_trends["month"] = engagement_trends["attendMonth"].fillna(engagement_trends["submitMonth"])
-    engagement_trends = engagement_trends.drop(columns=["attendMonth", "submitMonth"])
-    engagement_trends = engagement_trends.sort_values("month")
+    att = pd.DataFrame({"attendMonth": month_start(live_session_attendance["attendedAt"]), "id": live_session_attendance["id"]})
+    att_month = _nunique_by(att, "attendMonth", "id")
+
+    subs = pd.DataFrame({"submitMonth": month_start(assignment_submissions["submittedAt"]), "id": assignment_submissions["id"]})
+    subs_month = _nunique_by(subs, "submitMonth", "id")
+
+    # Align both monthly counts on the sorted union of months instead of outer-merging and coalescing keys.
+    months = att_month.index.union(subs_month.index)
+    engagement_trends = pd.DataFrame(
+        {
+            "attendanceEvents": att_month.reindex(months).to_numpy(),
+            "submissionEvents": subs_month.reindex(months).to_numpy(),
+            "month": months,
+        }
+    )
     save_table(engagement_trends, settings.table_dir / "engagement_trends_over_time.csv")
     ctx.add_result("engagement_trends_over_time", engagement_trends)
 
     # Join rate trends (gateway vs non-gateway sessions)
     session_flags = classify_gateway_sessions(live_sessions)
-    session_att = live_session_assigned.groupby("liveSessionId")["userId"].nunique().reset_index().rename(columns={"userId": "assignedCount"})
-    session_attend = live_session_attendance.groupby("liveSessionId")["studentId"].nunique().reset_index().rename(columns={"studentId": "attendedCount"})
+    session_att = _nunique_by(live_session_assigned, "liveSessionId", "userId").reset_index().rename(columns={"userId": "assignedCount"})
+    session_attend = _nunique_by(live_session_attendance, "liveSessionId", "studentId").reset_index().rename(columns={"studentId": "attendedCount"})
     session_join = session_flags.merge(session_att, on="liveSessionId", how="left").merge(session_attend, on="liveSessionId", how="left")
     session_join["assignedCount"] = session_join["assignedCount"].fillna(0)
     session_join["attendedCount"] = session_join["attendedCount"].fillna(0)
@@ -315,9 +369,12 @@ async def build_tables(ctx: Context) -> None:
     ctx.add_result("absconded_detail", absconded)
 
     # Context table: why "strict completion" can be 0% (separate thresholds vs combined).
-    completion_flags = completion.copy()
-    completion_flags["meet_attendance_70"] = completion_flags["attendanceRate"] >= 0.7
-    completion_flags["meet_assignments_70"] = completion_flags["assignmentCompletionRate"] >= 0.7
+    completion_flags = pd.DataFrame(
+        {
+            "meet_attendance_70": completion["attendanceRate"] >= 0.7,
+            "meet_assignments_70": completion["assignmentCompletionRate"] >= 0.7,
+        }
+    )
     completion_flags["meet_both_70"] = completion_flags["meet_attendance_70"] & completion_flags["meet_assignments_70"]
     threshold_breakdown = pd.DataFrame(
         {
@@ -337,22 +394,22 @@ async def build_tables(ctx: Context) -> None:
     save_table(threshold_breakdown, settings.table_dir / "completion_threshold_breakdown.csv")
     ctx.add_result("completion_threshold_breakdown", threshold_breakdown)
     completion_summary = completion.groupby("courseId")["isComplete"].mean().reset_index().rename(columns={"isComplete": "completionRate"})
-    completion_summary = completion_summary.merge(course_titles, on="courseId", how="left")
+    completion_summary = completion_summary.join(course_titles, on="courseId", how="left")
     if "courseTitle" in completion_summary.columns:
         completion_summary = completion_summary[["courseTitle", "courseId", "completionRate"]]
     save_table(completion_summary, settings.table_dir / "course_completion_summary.csv")
     ctx.add_result("course_completion_summary", completion_summary)
 
     absconded_by_course = absconded.groupby("courseId")["isAbsconded"].mean().reset_index().rename(columns={"isAbsconded": "abscondRate"})
-    absconded_by_course = absconded_by_course.merge(course_titles, on="courseId", how="left")
+    absconded_by_course = absconded_by_course.join(course_titles, on="courseId", how="left")
     if "courseTitle" in absconded_by_course.columns:
         absconded_by_course = absconded_by_course[["courseTitle", "courseId", "abscondRate"]]
     save_table(absconded_by_course, settings.table_dir / "absconded_by_course.csv")
     ctx.add_result("absconded_by_course", absconded_by_course)
 
     # Assignment submissions summary
-    assigned_users_by_module = module_assigned_users.groupby("moduleId")["userId"].nunique().reset_index().rename(columns={"userId": "assignedUsers"})
-    submission_counts = assignment_submissions.groupby("assignmentId")["studentId"].nunique().reset_index().rename(columns={"studentId": "submissions"})
+    assigned_users_by_module = _nunique_by(module_assigned_users, "moduleId", "userId").reset_index().rename(columns={"userId": "assignedUsers"})
+    submission_counts = _nunique_by(assignment_submissions, "assignmentId", "studentId").reset_index().rename(columns={"studentId": "submissions"})
     assignment_submission_summary = assignments.merge(submission_counts, left_on="id", right_on="assignmentId", how="left")
     assignment_submission_summary = assignment_submission_summary.merge(assigned_users_by_module, on="moduleId", how="left")
     assignment_submission_summary["submissions"] = assignment_submission_summary["submissions"].fillna(0)
@@ -368,86 +425,73 @@ async def build_tables(ctx: Context) -> None:
         how="left",
     )
     time_to_submit["baselineAt"] = time_to_submit["dueDate"].where(time_to_submit["dueDate"].notna(), time_to_submit["publishedAt"])
-    time_to_submit["time_to_submit_hours"] = (time_to_submit["submittedAt"] - time_to_submit["baselineAt"]).dt.total_seconds() / 3600
+    time_to_submit["time_to_submit_hours"] = _hours_between(time_to_submit["submittedAt"], time_to_submit["baselineAt"])
     time_to_submit = time_to_submit[["assignmentId", "time_to_submit_hours"]].dropna(subset=["time_to_submit_hours"])
     save_table(time_to_submit, settings.table_dir / "time_to_submit_distribution.csv")
     ctx.add_result("time_to_submit_distribution", time_to_submit)
 
-    grading_latency = assignment_submissions.dropna(subset=["submittedAt", "gradedAt"]).copy()
+    grading_latency = assignment_submissions.dropna(subset=["submittedAt", "gradedAt"])
     if not grading_latency.empty:
-        grading_latency["gradingHours"] = (grading_latency["gradedAt"] - grading_latency["submittedAt"]).dt.total_seconds() / 3600
-        grading_latency_summary = grading_latency.groupby("assignmentId")["gradingHours"].agg(["count", "mean", "median"]).reset_index()
-        grading_latency_summary = grading_latency_summary.merge(assignments[["id", "title"]], left_on="assignmentId", right_on="id", how="left")
+        grading_hours = pd.Series(_hours_between(grading_latency["gradedAt"], grading_latency["submittedAt"]), index=grading_latency.index, name="gradingHours")
+        grading_latency_summary = grading_hours.groupby(grading_latency["assignmentId"]).agg(["count", "mean", "median"]).reset_index()
+        grading_latency_summary["title"] = grading_latency_summary["assignmentId"].map(assignment_titles)
         save_table(grading_latency_summary[["assignmentId", "title", "count", "mean", "median"]], settings.table_dir / "grading_latency.csv")
         ctx.add_result("grading_latency", grading_latency_summary)
 
     # Login engagement
-    login_success = login_history[login_history["status"] == "success"].copy()
-    login_success["loginDate"] = login_success["timestamp"].dt.date
-    daily_active = login_success.groupby("loginDate")["userId"].nunique().reset_index().rename(columns={"userId": "DAU"})
+    login_success = login_history.loc[login_history["status"] == "success", ["userId", "timestamp"]]
+    login_success = login_success.assign(loginDate=login_success["timestamp"].dt.date, loginMonth=month_start(login_success["timestamp"]))
+    daily_active = _nunique_by(login_success, "loginDate", "userId").reset_index().rename(columns={"userId": "DAU"})
     save_table(daily_active, settings.table_dir / "login_daily_active.csv")
     ctx.add_result("login_daily_active", daily_active)
 
-    login_success["loginMonth"] = month_start(login_success["timestamp"])
-    monthly_active = login_success.groupby("loginMonth")["userId"].nunique().reset_index().rename(columns={"userId": "MAU"})
+    monthly_active = _nunique_by(login_success, "loginMonth", "userId").reset_index().rename(columns={"userId": "MAU"})
     save_table(monthly_active, settings.table_dir / "login_monthly_active.csv")
     ctx.add_result("login_monthly_active", monthly_active)
 
     # Leads
-    leads = parse_form_submissions(form_submissions, forms)
-    leads_by_form = leads.groupby("formTitle")["submissionId"].nunique().reset_index().rename(columns={"submissionId": "leadCount"})
+    leads = _categorize(parse_form_submissions(form_submissions, forms), ["formTitle", "intentCategory"])
+    leads_by_form = _nunique_by(leads, "formTitle", "submissionId").reset_index().rename(columns={"submissionId": "leadCount"})
     save_table(leads_by_form, settings.table_dir / "inquiry_volume_by_form.csv")
     ctx.add_result("inquiry_volume_by_form", leads_by_form)
 
     leads["leadMonth"] = month_start(leads["submittedAt"])
-    leads_by_month = leads.groupby("leadMonth")["submissionId"].nunique().reset_index().rename(columns={"submissionId": "leadCount"})
+    leads_by_month = _nunique_by(leads, "leadMonth", "submissionId").reset_index().rename(columns={"submissionId": "leadCount"})
     save_table(leads_by_month, settings.table_dir / "inquiry_volume_by_month.csv")
     ctx.add_result("inquiry_volume_by_month", leads_by_month)
 
-    lead_intent = leads.groupby("intentCategory")["submissionId"].nunique().reset_index().rename(columns={"submissionId": "leadCount"})
+    lead_intent = _nunique_by(leads, "intentCategory", "submissionId").reset_index().rename(columns={"submissionId": "leadCount"})
     save_table(lead_intent, settings.table_dir / "inquiry_intent.csv")
     ctx.add_result("inquiry_intent", lead_intent)
 
-    lead_tags = leads.copy()
-    lead_tags["intentTagsList"] = lead_tags["intentTags"].fillna("").str.split(";")
-    lead_tags = lead_tags.explode("intentTagsList")
-    lead_tags = lead_tags[lead_tags["intentTagsList"].notna() & (lead_tags["intentTagsList"] != "")]
-    lead_tag_counts = lead_tags.groupby("intentTagsList")["submissionId"].nunique().reset_index().rename(columns={"intentTagsList": "intentTag", "submissionId": "leadCount"})
+    # Only leads that have tags are split and exploded; empty or non-string pieces drop out in one length check.
+    lead_tags = leads.loc[leads["intentTags"].notna(), ["submissionId", "intentTags"]]
+    lead_tags = lead_tags.assign(intentTagsList=lead_tags["intentTags"].astype(object).str.split(";")).explode("intentTagsList")
+    lead_tags = lead_tags[lead_tags["intentTagsList"].str.len() > 0]
+    lead_tag_counts = _nunique_by(lead_tags, "intentTagsList", "submissionId").reset_index().rename(columns={"intentTagsList": "intentTag", "submissionId": "leadCount"})
     lead_tag_counts["share"] = lead_tag_counts["leadCount"] / lead_tag_counts["leadCount"].sum()
     save_table(lead_tag_counts, settings.table_dir / "inquiry_intent_tags.csv")
     ctx.add_result("inquiry_intent_tags", lead_tag_counts)
 
-    def bucket_goal(text: object) -> str:
-        if not isinstance(text, str) or not text.strip():
-            return "none"
-        t = text.lower()
-        buckets = {
-            "data science/analytics": ["data science", "data scientist", "data analyst", "analytics"],
-            "salesforce": ["salesforce", "admin", "administrator", "crm"],
-            "business analysis": ["business analyst", "business analysis", "ba"],
-            "product management": ["product manager", "product management", "product owner"],
-            "cloud/devops": ["cloud", "devops", "aws", "azure", "gcp"],
-            "cybersecurity": ["cyber", "security", "infosec"],
-            "scrum/agile": ["scrum", "agile", "scrum master"],
-            "software engineering": ["software", "developer", "engineer", "programmer"],
-        }
-        for bucket, keys in buckets.items():
-            if any(k in t for k in keys):
-                return bucket
-        return "other"
-
-    goal_buckets = leads.copy()
-    goal_buckets["goalBucket"] = goal_buckets["careerGoal"].apply(bucket_goal)
-    goal_counts = goal_buckets.groupby("goalBucket")["submissionId"].nunique().reset_index().rename(columns={"submissionId": "count"})
+    # One regex alternation per bucket, checked in order so the first matching bucket wins.
+    career_goal = leads["careerGoal"].astype(object).str.lower()
+    goal_matches = [career_goal.str.contains(pattern, na=False) for pattern in GOAL_BUCKET_PATTERNS.values()]
+    goal_bucket = pd.Series(np.select(goal_matches, list(GOAL_BUCKET_PATTERNS), default="other"), index=leads.index)
+    goal_bucket = goal_bucket.mask(career_goal.isna() | (career_goal.str.strip() == ""), "none")
+    goal_buckets = pd.DataFrame({"goalBucket": goal_bucket, "submissionId": leads["submissionId"]})
+    goal_counts = _nunique_by(goal_buckets, "goalBucket", "submissionId").reset_index().rename(columns={"submissionId": "count"})
     goal_counts["share"] = goal_counts["count"] / goal_counts["count"].sum()
     save_table(goal_counts, settings.table_dir / "career_goal_buckets.csv")
     ctx.add_result("career_goal_buckets", goal_counts)
 
-    leads = leads.merge(users[["id", "email"]], left_on="email", right_on="email", how="left")
+    # Email -> user id lookup; the first user wins on duplicate emails and missing emails never link.
+    user_id_by_email = users.dropna(subset=["email"]).drop_duplicates("email").set_index("email")["id"]
+    leads["id"] = leads["email"].map(user_id_by_email)
     leads["isUser"] = leads["id"].notna()
-    paid_users = payments[payments["status"] == "succeeded"]["userId"].unique().tolist()
-    leads["isPaidUser"] = leads["id"].isin(paid_users)
-    lead_conversion = leads.groupby("formTitle").agg(
+    # Hash index of paying users, shared by the lead and segment paid flags.
+    paid_user_index = pd.Index(succeeded_payments["userId"].unique())
+    leads["isPaidUser"] = paid_user_index.get_indexer(leads["id"]) >= 0
+    lead_conversion = leads.groupby("formTitle", observed=True).agg(
         leads=("submissionId", "nunique"),
         users=("isUser", "sum"),
         paid_users=("isPaidUser", "sum"),
@@ -455,155 +499,180 @@ async def build_tables(ctx: Context) -> None:
     save_table(lead_conversion, settings.table_dir / "inquiry_conversion.csv")
     ctx.add_result("inquiry_conversion", lead_conversion)
 
-    # LLM skill gap extraction
+    # LLM skill gap extraction runs alongside the remaining tables; each of those only reads shared
+    # inputs and writes its own CSV/result, so they are pushed to worker threads.
     leads_llm_input = leads.rename(columns={"id": "userId"})
-    skill_gap = await extract_skill_gap_llm(
-        leads_llm_input,
-        settings.groq_api_key,
-        settings.groq_model,
-        settings.max_llm_rows,
-        settings.llm_batch_size,
-        settings.llm_batch_sleep_seconds,
-    )
+    # Only the steps that cost more than hashing their inputs are cached; input digests are shared.
+    frame_digests: dict[int, tuple[pd.DataFrame, bytes]] = {}
+
+    def _engagement_tables() -> None:
+        # Instructor performance
+        instructor = instructor_performance(live_sessions, live_session_assigned, live_session_attendance)
+        # Add human-readable instructor names
+        instructor_users = users.drop_duplicates("id")
+        first_name = instructor_users["firstName"].fillna("").astype(str).str.strip()
+        last_name = instructor_users["lastName"].fillna("").astype(str).str.strip()
+        instructor_name = pd.Series(first_name.str.cat(last_name, sep=" ").str.strip().to_numpy(), index=instructor_users["id"])
+        instructor["instructorName"] = instructor["createdById"].map(instructor_name)
+        save_table(instructor, settings.table_dir / "instructor_performance.csv")
+        ctx.add_result("instructor_performance", instructor)
+
+        # Buyer remorse
+        remorse = buyers_remorse_window(payments, live_session_attendance, assignment_submissions, login_history)
+        save_table(remorse, settings.table_dir / "buyers_remorse_window.csv")
+        ctx.add_result("buyers_remorse_window", remorse)
+
+        # Career goal vs spend
+        spend = succeeded_payments.groupby("userId", sort=False)["amount"].sum().reset_index()
+        career_spend = leads_llm_input.merge(spend, on="userId", how="left")
+        career_goal_spend = career_spend.groupby("careerGoal")["amount"].mean().reset_index().rename(columns={"amount": "avgSpend"})
+        save_table(career_goal_spend, settings.table_dir / "career_goal_spend.csv")
+        ctx.add_result("career_goal_spend", career_goal_spend)
+
+        # Payment plan engagement
+        payment_plan = payment_plan_engagement(assignment_submissions, payments, payment_commitments, custom_products)
+        save_table(payment_plan, settings.table_dir / "payment_plan_engagement.csv")
+        ctx.add_result("payment_plan_engagement", payment_plan)
+
+        # Sales lag
+        sales_lag_df = sales_lag(leads, users, payments)
+        save_table(sales_lag_df, settings.table_dir / "sales_lag_distribution.csv")
+        ctx.add_result("sales_lag_distribution", sales_lag_df)
+
+        # Agreement compliance
+        agreement_dist = assignment_agreements.merge(
+            assignments[["id", "publishedAt", "createdAt"]],
+            left_on="assignmentId",
+            right_on="id",
+            how="left",
+        )
+        agreement_dist["publishedAt"] = agreement_dist["publishedAt"].fillna(agreement_dist["createdAt"])
+        agreement_dist = agreement_dist.dropna(subset=["agreedAt", "publishedAt"])
+        agreement_dist["hoursToAgree"] = _hours_between(agreement_dist["agreedAt"], agreement_dist["publishedAt"])
+        agreement_dist = agreement_dist[["assignmentId", "hoursToAgree"]]
+        save_table(agreement_dist, settings.table_dir / "agreement_compliance_distribution.csv")
+        ctx.add_result("agreement_compliance_distribution", agreement_dist)
+
+        agreement_time = cached_step(
+            settings.cache_dir,
+            "agreement_compliance_time",
+            agreement_compliance_time,
+            assignments,
+            assignment_agreements,
+            frame_digests=frame_digests,
+        )
+        agreement_time["title"] = agreement_time["assignmentId"].map(assignment_titles)
+        save_table(agreement_time, settings.table_dir / "agreement_compliance_time.csv")
+        ctx.add_result("agreement_compliance_time", agreement_time)
+
+    def _finance_tables() -> None:
+        # Commitment vs cash
+        waterfall = commitment_vs_cash(payments, payment_commitments, custom_products)
+        save_table(waterfall, settings.table_dir / "revenue_waterfall.csv")
+        ctx.add_result("revenue_waterfall", waterfall)
+
+        # Payment plan default rate
+        default_rate = payment_plan_default_rate(payment_agreements, payment_commitments)
+        save_table(default_rate, settings.table_dir / "payment_plan_default_rate.csv")
+        ctx.add_result("payment_plan_default_rate", default_rate)
+
+        # Exceptions
+        exception_summary = exception_duration_summary(payment_exceptions)
+        save_table(exception_summary, settings.table_dir / "exception_duration_summary.csv")
+        ctx.add_result("exception_duration_summary", exception_summary)
+
+        exception_timeline_df = exception_timeline(payment_exceptions)
+        save_table(exception_timeline_df, settings.table_dir / "exception_timeline.csv")
+        ctx.add_result("exception_timeline", exception_timeline_df)
+
+        # Discount hook
+        discount_hook = discount_hook_summary(products, payments)
+        discount_hook = discount_hook.join(product_titles[["productTitle"]], on="productId", how="left")
+        if "productTitle" in discount_hook.columns:
+            discount_hook["discount_share"] = discount_hook["discount_sales"] / discount_hook["total_sales"].replace(0, np.nan)
+            discount_hook = discount_hook[["productTitle", "productId", "discount_sales", "full_sales", "total_sales", "discount_share"]]
+        save_table(discount_hook, settings.table_dir / "discount_hook_summary.csv")
+        ctx.add_result("discount_hook_summary", discount_hook)
+
+        # Investment vs engagement
+        invest_engage = investment_vs_engagement(assignment_submissions, payments)
+        save_table(invest_engage, settings.table_dir / "investment_vs_engagement.csv")
+        ctx.add_result("investment_vs_engagement", invest_engage)
+
+    def _product_tables() -> None:
+        # Best sellers + Pareto
+        pareto = product_revenue_pareto(payments, products)
+        if "productTitle" in pareto.columns:
+            pareto = pareto[["productTitle", "productId", "units", "revenue", "cumulative_revenue", "cumulative_share"]]
+        save_table(pareto, settings.table_dir / "product_revenue_pareto.csv")
+        ctx.add_result("product_revenue_pareto", pareto)
+
+        # Module saturation
+        saturation = module_saturation(modules, module_assigned_users)
+        save_table(saturation, settings.table_dir / "module_saturation.csv")
+        ctx.add_result("module_saturation", saturation)
+
+        # Gateway upgrade
+        gateway_summary, gateway_timeline = cached_step(
+            settings.cache_dir,
+            "gateway_upgrade",
+            gateway_upgrade,
+            payments,
+            products,
+            settings.gateway_price_quantile,
+            settings.mentorship_price_quantile,
+            frame_digests=frame_digests,
+        )
+        save_table(gateway_summary, settings.table_dir / "gateway_upgrade_summary.csv")
+        save_table(gateway_timeline, settings.table_dir / "gateway_upgrade_timeline.csv")
+        ctx.add_result("gateway_upgrade_summary", gateway_summary)
+        ctx.add_result("gateway_upgrade_timeline", gateway_timeline)
+
+        # Ops gaps
+        ops_gaps = ops_gap_report(enrollments, payments, login_history, max_date)
+        save_table(ops_gaps, settings.table_dir / "ops_gap_report.csv")
+        ctx.add_result("ops_gap_report", ops_gaps)
+
+    def _segment_tables() -> None:
+        # Golden layer correlations
+        engagement_df = assignment_completion.groupby("studentId", sort=False)["assignmentCompletionRate"].mean().reset_index().rename(columns={"studentId": "userId"})
+        golden = golden_layer_correlations(leads_llm_input.rename(columns={"id": "userId"}), engagement_df, payments)
+        if not golden.empty:
+            save_table(golden, settings.table_dir / "golden_layer_correlations.csv")
+            ctx.add_result("golden_layer_correlations", golden)
+
+        # Segment KPIs
+        segment = enrollments[["userId", "productId"]].drop_duplicates().merge(products[["id", "accessType"]], left_on="productId", right_on="id", how="left")
+        segment["isPaid"] = paid_user_index.get_indexer(segment["userId"]) >= 0
+        completion_flag = completion.groupby("userId", sort=False)["isComplete"].max()
+        segment["isComplete"] = segment["userId"].map(completion_flag).fillna(False)
+        segment_kpis = segment.groupby("accessType").agg(
+            enrollments=("userId", "nunique"),
+            paid_rate=("isPaid", "mean"),
+            completion_rate=("isComplete", "mean"),
+        ).reset_index()
+        save_table(segment_kpis, settings.table_dir / "segment_kpis.csv")
+        ctx.add_result("segment_kpis", segment_kpis)
+
+        # Users by role
+        users_by_role = _nunique_by(users, "roleId", "id").reset_index().merge(roles[["id", "name"]], left_on="roleId", right_on="id", how="left")
+        users_by_role = users_by_role.rename(columns={"id_x": "userCount", "name": "role"})
+        save_table(users_by_role[["roleId", "role", "userCount"]], settings.table_dir / "users_by_role.csv")
+        ctx.add_result("users_by_role", users_by_role)
+
+    loop = asyncio.get_running_loop()
+    table_groups = (_engagement_tables, _finance_tables, _product_tables, _segment_tables)
+    with ThreadPoolExecutor(max_workers=min(len(table_groups), os.cpu_count() or 1)) as pool:
+        skill_gap, *_ = await asyncio.gather(
+            extract_skill_gap_llm(
+                leads_llm_input,
+                settings.groq_api_key,
+                settings.groq_model,
+                settings.max_llm_rows,
+                settings.llm_batch_size,
+                settings.llm_batch_sleep_seconds,
+            ),
+            *(loop.run_in_executor(pool, group) for group in table_groups),
+        )
     save_table(skill_gap, settings.table_dir / "skill_gap_extractions.csv")
     ctx.add_result("skill_gap_extractions", skill_gap)
-
-    # Instructor performance
-    instructor = instructor_performance(live_sessions, live_session_assigned, live_session_attendance)
-    # Add human-readable instructor names
-    instructor_name = users[["id", "firstName", "lastName"]].copy()
-    instructor_name["instructorName"] = (
-        instructor_name["firstName"].fillna("").astype(str).str.strip()
-        + " "
-        + instructor_name["lastName"].fillna("").astype(str).str.strip()
-    ).str.strip()
-    instructor = instructor.merge(instructor_name[["id", "instructorName"]], left_on="createdById", right_on="id", how="left")
-    instructor = instructor.drop(columns=["id"])
-    save_table(instructor, settings.table_dir / "instructor_performance.csv")
-    ctx.add_result("instructor_performance", instructor)
-
-    # Buyer remorse
-    remorse = buyers_remorse_window(payments, live_session_attendance, assignment_submissions, login_history)
-    save_table(remorse, settings.table_dir / "buyers_remorse_window.csv")
-    ctx.add_result("buyers_remorse_window", remorse)
-
-    # Career goal vs spend
-    spend = payments[payments["status"] == "succeeded"].groupby("userId")["amount"].sum().reset_index()
-    career_spend = leads_llm_input.merge(spend, on="userId", how="left")
-    career_goal_spend = career_spend.groupby("careerGoal")["amount"].mean().reset_index().rename(columns={"amount": "avgSpend"})
-    save_table(career_goal_spend, settings.table_dir / "career_goal_spend.csv")
-    ctx.add_result("career_goal_spend", career_goal_spend)
-
-    # Payment plan engagement
-    payment_plan = payment_plan_engagement(assignment_submissions, payments, payment_commitments, custom_products)
-    save_table(payment_plan, settings.table_dir / "payment_plan_engagement.csv")
-    ctx.add_result("payment_plan_engagement", payment_plan)
-
-    # Sales lag
-    sales_lag_df = sales_lag(leads, users, payments)
-    save_table(sales_lag_df, settings.table_dir / "sales_lag_distribution.csv")
-    ctx.add_result("sales_lag_distribution", sales_lag_df)
-
-    # Agreement compliance
-    agreement_dist = assignment_agreements.merge(
-        assignments[["id", "publishedAt", "createdAt"]],
-        left_on="assignmentId",
-        right_on="id",
-        how="left",
-    )
-    agreement_dist["publishedAt"] = agreement_dist["publishedAt"].fillna(agreement_dist["createdAt"])
-    agreement_dist = agreement_dist.dropna(subset=["agreedAt", "publishedAt"])
-    agreement_dist["hoursToAgree"] = (agreement_dist["agreedAt"] - agreement_dist["publishedAt"]).dt.total_seconds() / 3600
-    agreement_dist = agreement_dist[["assignmentId", "hoursToAgree"]]
-    save_table(agreement_dist, settings.table_dir / "agreement_compliance_distribution.csv")
-    ctx.add_result("agreement_compliance_distribution", agreement_dist)
-
-    agreement_time = agreement_compliance_time(assignments, assignment_agreements)
-    agreement_time = agreement_time.merge(assignments[["id", "title"]], left_on="assignmentId", right_on="id", how="left").drop(columns=["id"])
-    save_table(agreement_time, settings.table_dir / "agreement_compliance_time.csv")
-    ctx.add_result("agreement_compliance_time", agreement_time)
-
-    # Commitment vs cash
-    waterfall = commitment_vs_cash(payments, payment_commitments, custom_products)
-    save_table(waterfall, settings.table_dir / "revenue_waterfall.csv")
-    ctx.add_result("revenue_waterfall", waterfall)
-
-    # Payment plan default rate
-    default_rate = payment_plan_default_rate(payment_agreements, payment_commitments)
-    save_table(default_rate, settings.table_dir / "payment_plan_default_rate.csv")
-    ctx.add_result("payment_plan_default_rate", default_rate)
-
-    # Exceptions
-    exception_summary = exception_duration_summary(payment_exceptions)
-    save_table(exception_summary, settings.table_dir / "exception_duration_summary.csv")
-    ctx.add_result("exception_duration_summary", exception_summary)
-
-    exception_timeline_df = exception_timeline(payment_exceptions)
-    save_table(exception_timeline_df, settings.table_dir / "exception_timeline.csv")
-    ctx.add_result("exception_timeline", exception_timeline_df)
-
-    # Discount hook
-    discount_hook = discount_hook_summary(products, payments)
-    discount_hook = discount_hook.merge(product_titles[["productId", "productTitle"]], on="productId", how="left")
-    if "productTitle" in discount_hook.columns:
-        discount_hook["discount_share"] = discount_hook["discount_sales"] / discount_hook["total_sales"].replace(0, np.nan)
-        discount_hook = discount_hook[["productTitle", "productId", "discount_sales", "full_sales", "total_sales", "discount_share"]]
-    save_table(discount_hook, settings.table_dir / "discount_hook_summary.csv")
-    ctx.add_result("discount_hook_summary", discount_hook)
-
-    # Investment vs engagement
-    invest_engage = investment_vs_engagement(assignment_submissions, payments)
-    save_table(invest_engage, settings.table_dir / "investment_vs_engagement.csv")
-    ctx.add_result("investment_vs_engagement", invest_engage)
-
-    # Best sellers + Pareto
-    pareto = product_revenue_pareto(payments, products)
-    if "productTitle" in pareto.columns:
-        pareto = pareto[["productTitle", "productId", "units", "revenue", "cumulative_revenue", "cumulative_share"]]
-    save_table(pareto, settings.table_dir / "product_revenue_pareto.csv")
-    ctx.add_result("product_revenue_pareto", pareto)
-
-    # Module saturation
-    saturation = module_saturation(modules, module_assigned_users)
-    save_table(saturation, settings.table_dir / "module_saturation.csv")
-    ctx.add_result("module_saturation", saturation)
-
-    # Gateway upgrade
-    gateway_summary, gateway_timeline = gateway_upgrade(payments, products, settings.gateway_price_quantile, settings.mentorship_price_quantile)
-    save_table(gateway_summary, settings.table_dir / "gateway_upgrade_summary.csv")
-    save_table(gateway_timeline, settings.table_dir / "gateway_upgrade_timeline.csv")
-    ctx.add_result("gateway_upgrade_summary", gateway_summary)
-    ctx.add_result("gateway_upgrade_timeline", gateway_timeline)
-
-    # Ops gaps
-    ops_gaps = ops_gap_report(enrollments, payments, login_history, max_date)
-    save_table(ops_gaps, settings.table_dir / "ops_gap_report.csv")
-    ctx.add_result("ops_gap_report", ops_gaps)
-
-    # Golden layer correlations
-    engagement_df = assignment_completion.groupby("studentId")["assignmentCompletionRate"].mean().reset_index().rename(columns={"studentId": "userId"})
-    golden = golden_layer_correlations(leads_llm_input.rename(columns={"id": "userId"}), engagement_df, payments)
-    if not golden.empty:
-        save_table(golden, settings.table_dir / "golden_layer_correlations.csv")
-        ctx.add_result("golden_layer_correlations", golden)
-
-    # Segment KPIs
-    paid_users = payments[payments["status"] == "succeeded"]["userId"].unique()
-    segment = enrollments[["userId", "productId"]].drop_duplicates().merge(products[["id", "accessType"]], left_on="productId", right_on="id", how="left")
-    segment["isPaid"] = segment["userId"].isin(paid_users)
-    completion_flag = completion.groupby("userId")["isComplete"].max().reset_index()
-    segment = segment.merge(completion_flag, on="userId", how="left")
-    segment["isComplete"] = segment["isComplete"].fillna(False)
-    segment_kpis = segment.groupby("accessType").agg(
-        enrollments=("userId", "nunique"),
-        paid_rate=("isPaid", "mean"),
-        completion_rate=("isComplete", "mean"),
-    ).reset_index()
-    save_table(segment_kpis, settings.table_dir / "segment_kpis.csv")
-    ctx.add_result("segment_kpis", segment_kpis)
-
-    # Users by role
-    users_by_role = users.groupby("roleId")["id"].nunique().reset_index().merge(roles[["id", "name"]], left_on="roleId", right_on="id", how="left")
-    users_by_role = users_by_role.rename(columns={"id_x": "userCount", "name": "role"})
-    save_table(users_by_role[["roleId", "role", "userCount"]], settings.table_dir / "users_by_role.csv")
-    ctx.add_result("users_by_role", users_by_role)
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import mmap
+import os
 import re
 from dataclasses import dataclass
 from pathlib import Path
 
 
-IMG_RE = re.compile(r"!\[(?P<alt>.*?)\]\((?P<path>.*?)\)")
+# Bytes patterns so they can scan the mmapped report directly; only matches are decoded.
+IMG_RE = re.compile(rb"!\[.*?\]\((.*?)\)")
+# Raw paths are scanned separately over the whole text so paths inside alt text are still found.
+RAW_PATH_RE = re.compile(rb"output[\\/](?:figures|tables)[\\/][-A-Za-z0-9_ .\\/]+")
 
 DEFAULT_KEEP_TABLES: set[str] = {
     # Psychographic / inquiries
@@ -58,18 +63,41 @@ class CleanupResult:
     kept_tables: int
 
 
-def _paths_referenced_in_report(report_md: str) -> set[str]:
-    refs: set[str] = set()
-    for m in IMG_RE.finditer(report_md):
-        rel = (m.group("path") or "").strip()
-        if rel:
-            refs.add(rel.replace("\\", "/"))
-    # Also support raw paths in markdown (rare, but useful for tables if we link them later)
-    for m in re.finditer(r"(output/(?:figures|tables)/[-A-Za-z0-9_ .\\\\/]+)", report_md):
-        refs.add(m.group(1).strip().replace("\\", "/"))
+def _paths_referenced_in_report(report_md: bytes | mmap.mmap) -> set[str]:
+    matches = IMG_RE.findall(report_md) + RAW_PATH_RE.findall(report_md)
+    refs = {m.decode("utf-8").strip().replace("\\", "/") for m in matches}
+    refs.discard("")
     return refs
 
 
+def _report_refs(report_md_path: Path) -> set[str]:
+    if not report_md_path.exists() or report_md_path.stat().st_size == 0:
+        return set()
+    with open(report_md_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return _paths_referenced_in_report(mm)
+
+
+def _prune_dir(directory: Path, suffix: str, rel_prefix: str, keep: set[str]) -> tuple[int, int]:
+    # Single scandir pass: delete what is not kept and count what remains.
+    deleted = 0
+    kept = 0
+    if not directory.exists():
+        return deleted, kept
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.name.endswith(suffix):
+                continue
+            if rel_prefix + entry.name in keep:
+                kept += 1
+                continue
+            try:
+                os.unlink(entry.path)
+                deleted += 1
+            except Exception:
+                kept += 1
+    return deleted, kept
+
+
 def cleanup_outputs(
     *,
     base_dir: Path,
@@ -83,8 +111,7 @@ def cleanup_outputs(
     - Figures: keep only images referenced by report.md.
     - Tables: keep only an allowlist (plus any tables referenced by report.md).
     """
-    report_md = report_md_path.read_text(encoding="utf-8") if report_md_path.exists() else ""
-    refs = _paths_referenced_in_report(report_md)
+    refs = _report_refs(report_md_path)
 
     fig_dir = base_dir / "output" / "figures"
     table_dir = base_dir / "output" / "tables"
@@ -100,33 +127,8 @@ def cleanup_outputs(
         if norm.startswith("output/tables/"):
             keep_tabs.add(norm)
 
-    deleted_figures = 0
-    deleted_tables = 0
-
-    # Figures
-    if fig_dir.exists():
-        for p in fig_dir.glob("*.png"):
-            rel = f"output/figures/{p.name}"
-            if rel not in keep_figs:
-                try:
-                    p.unlink()
-                    deleted_figures += 1
-                except Exception:
-                    pass
-
-    # Tables
-    if table_dir.exists():
-        for p in table_dir.glob("*.csv"):
-            rel = f"output/tables/{p.name}"
-            if rel not in keep_tabs:
-                try:
-                    p.unlink()
-                    deleted_tables += 1
-                except Exception:
-                    pass
-
-    kept_figures = len(list(fig_dir.glob("*.png"))) if fig_dir.exists() else 0
-    kept_tables = len(list(table_dir.glob("*.csv"))) if table_dir.exists() else 0
+    deleted_figures, kept_figures = _prune_dir(fig_dir, ".png", "output/figures/", keep_figs)
+    deleted_tables, kept_tables = _prune_dir(table_dir, ".csv", "output/tables/", keep_tabs)
 
     return CleanupResult(
         deleted_figures=deleted_figures,
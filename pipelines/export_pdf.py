@@ -2,9 +2,12 @@
 
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterable
 
+import numpy as np
+
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, portrait
 from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
@@ -26,6 +29,7 @@ from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
 IMG_RE = re.compile(r"!\[(?P<alt>.*?)\]\((?P<path>.*?)\)")
 MD_BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
 MD_OL_RE = re.compile(r"^\s*(\d+)\.\s+(.*)$")
+SEP_RE = re.compile(r"^[\s\-|:]+$")
 PAGEBREAK_MARKERS = {"---PAGEBREAK---", "<!--PAGEBREAK-->", "<!-- PAGEBREAK -->"}
 
 
@@ -35,6 +39,7 @@ class Block:
     data: object
 
 
+@lru_cache(maxsize=1)
 def _register_fonts() -> tuple[str, str]:
     cambria_ttc = Path(r"C:\Windows\Fonts\cambria.ttc")
     cambria_bold = Path(r"C:\Windows\Fonts\cambriab.ttf")
@@ -56,28 +61,133 @@ def _register_fonts() -> tuple[str, str]:
     return body_font, body_bold
 
 
+@dataclass(frozen=True)
+class PdfStyles:
+    title: ParagraphStyle
+    h1: ParagraphStyle
+    h2: ParagraphStyle
+    body: ParagraphStyle
+    bullet: ParagraphStyle
+    caption: ParagraphStyle
+    table_cell: ParagraphStyle
+
+
+@lru_cache(maxsize=4)
+def _styles(body_font: str, body_bold: str) -> PdfStyles:
+    sample = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        "Title",
+        parent=sample["Title"],
+        fontName=body_bold,
+        fontSize=18,
+        leading=22,
+        alignment=TA_CENTER,
+        spaceAfter=12,
+    )
+    h1_style = ParagraphStyle(
+        "H1",
+        parent=sample["Heading1"],
+        fontName=body_bold,
+        fontSize=14,
+        leading=18,
+        spaceBefore=12,
+        spaceAfter=6,
+    )
+    h2_style = ParagraphStyle(
+        "H2",
+        parent=sample["Heading2"],
+        fontName=body_bold,
+        fontSize=12.5,
+        leading=16,
+        spaceBefore=10,
+        spaceAfter=6,
+    )
+    body_style = ParagraphStyle(
+        "Body",
+        parent=sample["BodyText"],
+        fontName=body_font,
+        fontSize=11,
+        leading=14,
+        alignment=TA_JUSTIFY,
+        spaceAfter=8,
+    )
+    bullet_style = ParagraphStyle(
+        "Bullet",
+        parent=body_style,
+        leftIndent=14,
+        bulletIndent=6,
+    )
+    caption_style = ParagraphStyle(
+        "Caption",
+        parent=sample["BodyText"],
+        fontName=body_font,
+        fontSize=10,
+        leading=12,
+        alignment=TA_CENTER,
+        textColor=colors.HexColor("#444444"),
+        spaceAfter=10,
+    )
+    table_cell_style = ParagraphStyle(
+        "TableCell",
+        fontName=body_font,
+        fontSize=10.5,
+        leading=12,
+        alignment=TA_LEFT,
+    )
+
+    return PdfStyles(
+        title=title_style,
+        h1=h1_style,
+        h2=h2_style,
+        body=body_style,
+        bullet=bullet_style,
+        caption=caption_style,
+        table_cell=table_cell_style,
+    )
+
+
+def _table_cell(text: str, max_width: float, style: ParagraphStyle) -> Paragraph | str:
+    # Plain strings skip Paragraph's markup parse and layout; keep a Paragraph for bold/markup
+    # or for text that would not fit on one line of its column.
+    if "**" in text or "<" in text or "&" in text or pdfmetrics.stringWidth(text, style.fontName, style.fontSize) > max_width:
+        return Paragraph(MD_BOLD_RE.sub(r"<b>\1</b>", text), style)
+    return text
+
+
 def _parse_markdown(md: str) -> list[Block]:
-    lines = md.splitlines()
     blocks: list[Block] = []
-
-    i = 0
     para_buf: list[str] = []
 
     def flush_para() -> None:
         nonlocal para_buf
-        text = "\n".join([l.strip() for l in para_buf]).strip()
-        if text:
-            blocks.append(Block("paragraph", text))
+        # para_buf only holds stripped, non-empty lines; classify list paragraphs once here.
+        if not para_buf:
+            return
+        if all(l.startswith("-") for l in para_buf):
+            blocks.append(Block("bullets", [l.lstrip("-").strip() for l in para_buf]))
+        elif all(MD_OL_RE.match(l) for l in para_buf):
+            blocks.append(Block("ol", [MD_OL_RE.match(l).groups() for l in para_buf]))
+        else:
+            blocks.append(Block("paragraph", "\n".join(para_buf)))
         para_buf = []
 
-    while i < len(lines):
-        line = lines[i].rstrip("\n")
+    # Single forward pass; a table consumes lines until the first non-table line, which is
+    # handed back through `pending` instead of re-indexing.
+    lines = iter(md.splitlines())
+    pending: str | None = None
+    while True:
+        if pending is not None:
+            line, pending = pending, None
+        else:
+            line = next(lines, None)
+            if line is None:
+                break
+        stripped = line.strip()
 
         # Explicit page breaks (for 1-page exec summary, etc.)
-        if line.strip() in PAGEBREAK_MARKERS:
+        if stripped in PAGEBREAK_MARKERS:
             flush_para()
             blocks.append(Block("pagebreak", None))
-            i += 1
             continue
 
         # Headings
@@ -86,7 +196,6 @@ def _parse_markdown(md: str) -> list[Block]:
             level = len(line) - len(line.lstrip("#"))
             title = line.lstrip("#").strip()
             blocks.append(Block("heading", (level, title)))
-            i += 1
             continue
 
         # Images
@@ -94,38 +203,35 @@ def _parse_markdown(md: str) -> list[Block]:
         if m:
             flush_para()
             blocks.append(Block("image", (m.group("alt").strip(), m.group("path").strip())))
-            i += 1
             continue
 
         # Tables
-        if line.strip().startswith("|") and "|" in line.strip()[1:]:
+        if stripped.startswith("|") and "|" in stripped[1:]:
             flush_para()
-            table_lines = []
-            while i < len(lines) and lines[i].strip().startswith("|"):
-                table_lines.append(lines[i].strip())
-                i += 1
-
-            # Remove separator rows like | --- | --- |
             rows = []
-            for tl in table_lines:
-                parts = [p.strip() for p in tl.strip("|").split("|")]
-                if all(p.replace("-", "").strip() == "" for p in parts):
-                    continue
-                rows.append(parts)
+            while True:
+                # Remove separator rows like | --- | --- |
+                if not SEP_RE.match(stripped):
+                    rows.append([p.strip() for p in stripped.strip("|").split("|")])
+                nxt = next(lines, None)
+                if nxt is None:
+                    break
+                stripped = nxt.strip()
+                if not stripped.startswith("|"):
+                    pending = nxt
+                    break
 
             if rows:
                 blocks.append(Block("table", rows))
             continue
 
         # Blank line = paragraph boundary
-        if not line.strip():
+        if not stripped:
             flush_para()
-            i += 1
             continue
 
         # Bullets: keep as paragraph text; ReportLab will wrap
-        para_buf.append(line)
-        i += 1
+        para_buf.append(stripped)
 
     flush_para()
     return blocks
@@ -137,64 +243,11 @@ def export_pdf(
     base_dir: Path,
 ) -> None:
     body_font, body_bold = _register_fonts()
+    styles = _styles(body_font, body_bold)
 
     md = report_md_path.read_text(encoding="utf-8")
     blocks = _parse_markdown(md)
 
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        "Title",
-        parent=styles["Title"],
-        fontName=body_bold,
-        fontSize=18,
-        leading=22,
-        alignment=TA_CENTER,
-        spaceAfter=12,
-    )
-    h1_style = ParagraphStyle(
-        "H1",
-        parent=styles["Heading1"],
-        fontName=body_bold,
-        fontSize=14,
-        leading=18,
-        spaceBefore=12,
-        spaceAfter=6,
-    )
-    h2_style = ParagraphStyle(
-        "H2",
-        parent=styles["Heading2"],
-        fontName=body_bold,
-        fontSize=12.5,
-        leading=16,
-        spaceBefore=10,
-        spaceAfter=6,
-    )
-    body_style = ParagraphStyle(
-        "Body",
-        parent=styles["BodyText"],
-        fontName=body_font,
-        fontSize=11,
-        leading=14,
-        alignment=TA_JUSTIFY,
-        spaceAfter=8,
-    )
-    bullet_style = ParagraphStyle(
-        "Bullet",
-        parent=body_style,
-        leftIndent=14,
-        bulletIndent=6,
-    )
-    caption_style = ParagraphStyle(
-        "Caption",
-        parent=styles["BodyText"],
-        fontName=body_font,
-        fontSize=10,
-        leading=12,
-        alignment=TA_CENTER,
-        textColor=colors.HexColor("#444444"),
-        spaceAfter=10,
-    )
-
     doc = SimpleDocTemplate(
         str(pdf_path),
         pagesize=portrait(letter),
@@ -212,23 +265,15 @@ def export_pdf(
 
     current_section = None
 
-    table_cell_style = ParagraphStyle(
-        "TableCell",
-        fontName=body_font,
-        fontSize=10.5,
-        leading=12,
-        alignment=TA_LEFT,
-    )
-
     for block in blocks:
         if block.kind == "heading":
             level, title = block.data  # type: ignore[misc]
             if level == 1:
-                story.append(Paragraph(title, title_style))
+                story.append(Paragraph(title, styles.title))
             elif level == 2:
-                story.append(Paragraph(title, h1_style))
+                story.append(Paragraph(title, styles.h1))
             else:
-                story.append(Paragraph(title, h2_style))
+                story.append(Paragraph(title, styles.h2))
             current_section = title
             continue
 
@@ -236,54 +281,54 @@ def export_pdf(
             story.append(PageBreak())
             continue
 
+        if block.kind == "bullets":
+            for content in block.data:  # type: ignore[union-attr]
+                content = MD_BOLD_RE.sub(r"<b>\1</b>", content)
+                story.append(Paragraph(f"• {content}", styles.bullet))
+            story.append(Spacer(1, 6))
+            continue
+
+        if block.kind == "ol":
+            for n, content in block.data:  # type: ignore[union-attr]
+                content = MD_BOLD_RE.sub(r"<b>\1</b>", content)
+                story.append(Paragraph(f"{n}. {content}", styles.bullet))
+            story.append(Spacer(1, 6))
+            continue
+
         if block.kind == "paragraph":
             text: str = block.data  # type: ignore[assignment]
             text = MD_BOLD_RE.sub(r"<b>\1</b>", text)
-            # Convert markdown bullets to simple bullets
-            lines = text.splitlines()
-            if all(l.strip().startswith("-") for l in lines if l.strip()):
-                for l in lines:
-                    if not l.strip():
-                        continue
-                    content = l.strip().lstrip("-").strip()
-                    story.append(Paragraph(f"• {content}", bullet_style))
-                story.append(Spacer(1, 6))
-            elif all(MD_OL_RE.match(l.strip()) for l in lines if l.strip()):
-                for l in lines:
-                    if not l.strip():
-                        continue
-                    m = MD_OL_RE.match(l.strip())
-                    if not m:
-                        continue
-                    n, content = m.group(1), m.group(2)
-                    story.append(Paragraph(f"{n}. {content}", bullet_style))
-                story.append(Spacer(1, 6))
-            else:
-                story.append(Paragraph(text.replace("\n", " "), body_style))
+            story.append(Paragraph(text.replace("\n", " "), styles.body))
             continue
 
         if block.kind == "table":
             rows: list[list[str]] = block.data  # type: ignore[assignment]
             headers = rows[0]
-            # Wrap cells so long content doesn't blow out page width
-            data: list[list[Paragraph]] = []
-            data.append([Paragraph(MD_BOLD_RE.sub(r"<b>\1</b>", h), table_cell_style) for h in headers])
-            for row in rows[1:]:
-                data.append([Paragraph(MD_BOLD_RE.sub(r"<b>\1</b>", str(c)), table_cell_style) for c in row])
 
             tbl_no += 1
             caption = f"Table {tbl_no}: {current_section or 'Summary'}"
-            story.append(Paragraph(caption, caption_style))
+            story.append(Paragraph(caption, styles.caption))
 
             # Create table with wrapping; allocate width proportional to content length.
             col_count = max(len(headers), 1)
-            col_max = [0] * col_count
-            for r_i, row in enumerate(rows):
-                for c_i in range(min(len(row), col_count)):
-                    col_max[c_i] = max(col_max[c_i], len(str(row[c_i] or "")))
-            weights = [max(m, 8) for m in col_max]
-            total_w = float(sum(weights)) or 1.0
-            col_widths = [(w / total_w) * doc.width for w in weights]
+            cell_lens = np.fromiter(
+                (len(row[c_i]) if c_i < len(row) else 0 for row in rows for c_i in range(col_count)),
+                dtype=np.int64,
+                count=len(rows) * col_count,
+            ).reshape(len(rows), col_count)
+            weights = np.maximum(cell_lens.max(axis=0), 8)
+            total_w = float(weights.sum()) or 1.0
+            col_widths = ((weights / total_w) * doc.width).tolist()
+            # Usable width per column after LEFT/RIGHTPADDING; cells past the header width always wrap.
+            text_widths = [w - 12 for w in col_widths]
+
+            # Wrap cells so long content doesn't blow out page width
+            data: list[list[Paragraph | str]] = []
+            data.append([Paragraph(MD_BOLD_RE.sub(r"<b>\1</b>", h), styles.table_cell) for h in headers])
+            for row in rows[1:]:
+                data.append(
+                    [_table_cell(c, text_widths[c_i] if c_i < col_count else 0.0, styles.table_cell) for c_i, c in enumerate(row)]
+                )
             t = Table(data, repeatRows=1, hAlign="LEFT", colWidths=col_widths)
             t.setStyle(
                 TableStyle(
@@ -291,7 +336,10 @@ def export_pdf(
                         ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1f77b4")),
                         ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
                         ("FONTNAME", (0, 0), (-1, 0), body_bold),
+                        # Plain-string cells take their font from the table rather than a Paragraph style.
+                        ("FONTNAME", (0, 1), (-1, -1), body_font),
                         ("FONTSIZE", (0, 0), (-1, -1), 10.5),
+                        ("LEADING", (0, 1), (-1, -1), 12),
                         ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#aaaaaa")),
                         ("VALIGN", (0, 0), (-1, -1), "TOP"),
                         ("LEFTPADDING", (0, 0), (-1, -1), 6),
@@ -317,7 +365,7 @@ def export_pdf(
             img_path = (base_dir / rel).resolve() if not Path(rel).is_absolute() else Path(rel)
             if not img_path.exists():
                 # Skip missing images but leave a note
-                story.append(Paragraph(f"[Missing image: {rel}]", body_style))
+                story.append(Paragraph(f"[Missing image: {rel}]", styles.body))
                 continue
 
             fig_no += 1
@@ -330,7 +378,7 @@ def export_pdf(
             img.drawHeight = ih * scale
 
             story.append(img)
-            story.append(Paragraph(f"Figure {fig_no}: {alt}", caption_style))
+            story.append(Paragraph(f"Figure {fig_no}: {alt}", styles.caption))
             continue
 
     doc.build(story)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from analytics.io.writers import cached_step
+
+
+def _counting_step(calls: list[int]):
+    def step(df: pd.DataFrame) -> pd.DataFrame:
+        calls.append(1)
+        return df.groupby("userId", as_index=False)["amount"].sum()
+
+    return step
+
+
+def test_cached_step_hits_on_unchanged_input(tmp_path):
+    calls: list[int] = []
+    step = _counting_step(calls)
+    df = pd.DataFrame({"userId": [1, 1, 2], "amount": [1.0, 2.0, 3.0]})
+
+    first = cached_step(tmp_path, "totals", step, df)
+    second = cached_step(tmp_path, "totals", step, df.copy())
+
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_cached_step_recomputes_and_drops_stale_entry_when_input_changes(tmp_path):
+    calls: list[int] = []
+    step = _counting_step(calls)
+    df = pd.DataFrame({"userId": [1, 1, 2], "amount": [1.0, 2.0, 3.0]})
+
+    cached_step(tmp_path, "totals", step, df)
+    changed = df.assign(amount=[1.0, 2.0, 4.0])
+    result = cached_step(tmp_path, "totals", step, changed)
+
+    assert len(calls) == 2
+    assert result["amount"].tolist() == [3.0, 4.0]
+    assert len(list(tmp_path.glob("totals-*.pkl"))) == 1
+
+
+def test_cached_step_distinguishes_object_value_types(tmp_path):
+    calls: list[int] = []
+    step = _counting_step(calls)
+    ints = pd.DataFrame({"userId": pd.Series([1, 2], dtype=object), "amount": [1.0, 2.0]})
+    strs = pd.DataFrame({"userId": pd.Series(["1", "2"], dtype=object), "amount": [1.0, 2.0]})
+
+    cached_step(tmp_path, "totals", step, ints)
+    result = cached_step(tmp_path, "totals", step, strs)
+
+    assert len(calls) == 2
+    assert result["userId"].tolist() == ["1", "2"]
+
+
+def test_cached_step_recovers_from_truncated_entry(tmp_path):
+    calls: list[int] = []
+    step = _counting_step(calls)
+    df = pd.DataFrame({"userId": [1, 2], "amount": [1.0, 2.0]})
+
+    cached_step(tmp_path, "totals", step, df)
+    (entry,) = tmp_path.glob("totals-*.pkl")
+    entry.write_bytes(entry.read_bytes()[:10])
+    result = cached_step(tmp_path, "totals", step, df)
+
+    assert len(calls) == 2
+    assert result["amount"].tolist() == [1.0, 2.0]
+    assert not list(tmp_path.glob("*.tmp"))